@@ -0,0 +1,43 @@
+import argparse
+import json
+import sys
+
+from core.testing import benchmark
+
+def parse_size(value: str) -> tuple[int, int]:
+    width, height = value.lower().split("x")
+    return (int(width), int(height))
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure frame costs of the element pipeline against synthetic stop data. Must be run from the repository root.")
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=list(benchmark.DEFAULT_WINDOW_SIZES), help="Window sizes as WIDTHxHEIGHT.")
+    parser.add_argument("--departures", nargs="+", type=int, default=list(benchmark.DEFAULT_DEPARTURE_COUNTS), help="Departure counts.")
+    parser.add_argument("--steady-frames", type=int, default=120)
+    parser.add_argument("--rollover-frames", type=int, default=30)
+    parser.add_argument("--output", default="-", help="Path of the JSON results. Written into stdout when set to '-'.")
+    parser.add_argument("--baseline", default=None, help="Path of previous JSON results. Exits with code 1 if any frame cost regressed.")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown compared to the baseline as a fraction.")
+    args = parser.parse_args()
+
+    scenarios = benchmark.create_scenarios(args.sizes, args.departures, args.steady_frames, args.rollover_frames)
+    results = benchmark.run(scenarios)
+
+    output: str = json.dumps({"results": results}, indent=4)
+    if args.output == "-":
+        print(output)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+    if args.baseline is not None:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+        regressions: list[str] = benchmark.find_regressions(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        if len(regressions) > 0:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import threading as _threading
+from core import config as _config
+from core import frame_scheduler as _frame_scheduler
+from core import logging as _logging
+from core import render_info as _render_info
+from core import renderer as _renderer
+from core.debug import element_timings as _element_timings
+import digitransit.routing as _routing
+
+class Board:
+    def __init__(self, name: str, board_config: _config.Config) -> None:
+        """
+        A single stop board. Boards share the process, the caches and the render thread.
+
+        Only the active board can be rendered. Activating a board swaps `config.current`, `render_info.active` and the renderer state.
+        """
+        self.name: str = name
+        self.config: _config.Config = board_config
+        self.info: _render_info.BoardInfo = _render_info.BoardInfo(board_config)
+        self.renderer_state: _renderer.RendererState = _renderer.RendererState()
+
+    def activate(self) -> None:
+        global _active
+        if _active is self:
+            return
+
+        if _active is not None:
+            _active.renderer_state = _renderer.get_state()
+
+        _renderer.set_state(self.renderer_state)
+        _config.current = self.config
+        _render_info.active = self.info
+        _element_timings.set_label_prefix(f"{self.name}/" if is_multi_board() else "")
+        _active = self
+
+_active: Board | None = None
+
+_base_config: _config.Config | None = None
+_boards: tuple[Board, ...] = tuple()
+
+def init() -> None:
+    """Create the boards from `config.current`. Must be called after `config.init`."""
+    global _base_config, _boards
+
+    _base_config = _config.current
+    if len(_base_config.boards) < 1:
+        _boards = (Board("main", _base_config),)
+    else:
+        created: list[Board] = []
+        for i, overrides in enumerate(_base_config.boards):
+            board_config: _config.Config = _base_config.with_overrides(overrides)
+            created.append(Board(f"board{i}_{board_config.stopcode}", board_config))
+        _boards = tuple(created)
+        _validate_frame_output_paths(_boards)
+
+    _logging.info(f"Created {len(_boards)} boards: {', '.join(board.name for board in _boards)}", stack_info=False)
+
+def _validate_frame_output_paths(boards: tuple[Board, ...]) -> None:
+    paths: dict[str, str] = {}
+    for board in boards:
+        if board.config.frame_output_format is None or board.config.frame_output_path is None:
+            continue
+
+        path: str = board.config.frame_output_path
+        if path in paths:
+            raise ValueError(f"Boards '{paths[path]}' and '{board.name}' write frames into the same path: '{path}'. Override frame_output_path per board.")
+        paths[path] = board.name
+
+def get_boards() -> tuple[Board, ...]:
+    return _boards
+
+def is_multi_board() -> bool:
+    return len(_boards) > 1
+
+def get_poll_groups() -> dict[int, tuple[Board, ...]]:
+    """Boards keyed by their stop info poll rate."""
+    groups: dict[int, list[Board]] = {}
+    for board in _boards:
+        groups.setdefault(board.config.poll_rate, []).append(board)
+    return {poll_rate: tuple(group) for poll_rate, group in groups.items()}
+
+def fetch_stopinfos(boards: tuple[Board, ...] | None = None) -> tuple[tuple[Board, _routing.Stop | None], ...]:
+    """
+    Blocking. Fetch the stop info of `boards` or every board if `None`.
+    Boards that share an endpoint, an API key and a batch size are fetched in batches of `stop_batch_size`.
+
+    Does not modify the boards so that it can be called from the fetch loop.
+    The stop is `None` if it was not found or if its request failed. Failed requests are logged and do not affect the other requests.
+    """
+    _logging.info("Fetching stop info...", stack_info=False)
+    if boards is None:
+        boards = _boards
+
+    groups: dict[tuple[str, str, int], list[Board]] = {}
+    for board in boards:
+        groups.setdefault((board.config.endpoint, board.config.api_key.value, board.config.stop_batch_size), []).append(board)
+
+    stops: dict[Board, _routing.Stop | None] = {board: None for board in boards}
+    for (endpoint, api_key, batch_size), group in groups.items():
+        queries: list[_routing.StopQuery] = [board.info.get_stop_query() for board in group]
+        try:
+            fetched: list[_routing.Stop | None] = _routing.get_stops_info(endpoint, api_key, queries, batch_size, reuse_unchanged=True)
+        except Exception as e:
+            _logging.dump_exception(e, _threading.current_thread(), "requestFail")
+            continue
+
+        for board, stop in zip(group, fetched):
+            stops[board] = stop
+
+    return tuple(stops.items())
+
+def set_stopinfos(stops: tuple[tuple[Board, _routing.Stop | None], ...]) -> None:
+    """Result callback of the fetch loop."""
+    for board, stop in stops:
+        if stop is None:
+            _logging.warning(f"Stop not found for board '{board.name}'. Keeping previous stop info.", stack_info=False)
+            continue
+        board.info.stopinfo = stop # Unchanged responses return the previous object so the stoptimes are left as is
+
+def update_stopinfos() -> None:
+    """Fetch the stop info of every board on the calling thread."""
+    try:
+        set_stopinfos(fetch_stopinfos())
+    except Exception as e:
+        _logging.dump_exception(e, _threading.current_thread(), "requestFail")
+    else:
+        _frame_scheduler.request_wakeup()
+
+def quit() -> None:
+    """Restore the config loaded from disk so that board overrides are not saved."""
+    if _base_config is not None:
+        _config.current = _base_config
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, replace
 from types import UnionType
 from typing import Annotated, Any, Generic, NamedTuple, TypeVar, get_args, get_type_hints
 
@@ -54,12 +54,30 @@ class Config:
     framerate: int = -1
     """Limit the window refresh rate. (`-1` to disable limit)"""
 
+    max_idle_time: float = 1.0
+    """The longest time in seconds to sleep between frames when no changes are scheduled. Data fetched in the background is shown after this delay at the latest. (`0` to disable idling)"""
+
     hide_mouse: bool = True
     """Hide mouse when over window."""
 
+    headless: bool = False
+    """Render into an offscreen surface of size `window_size` instead of a window. Uses SDL's dummy video driver so that no display is required."""
+
+    frame_output_format: str | None = None
+    """Write rendered frames into `frame_output_path`. `"png"` saves an image per frame, `"raw"` appends raw RGB bytes. (`null` to disable)"""
+
+    frame_output_path: str | None = None
+    """Path for the frame output. Required when `frame_output_format` is set. PNG paths can contain `{frame}` to number the images. Raw output writes into stdout when set to `-` and console logging is moved to stderr."""
+
     enabled_embeds: list[str] = field(default_factory=list)
     """A janky way to enable embeds. Will be improved upon later... At least I hope so."""
 
+    stop_batch_size: int = 20
+    """The most stops to fetch in a single request when rendering multiple boards. Lower this if the server rejects large queries."""
+
+    boards: list[dict] = field(default_factory=list)
+    """Render multiple stops in one process. Each board is an object of settings that override the settings above (i.e. `{"stopcode": 825, "frame_output_path": "825/{frame}.png"}`). Boards are always rendered offscreen. Boards with the same `poll_rate` are fetched together. (empty to render a single board)"""
+
     nysse_api_client_id: str | None = None
     """Nysse API client id to enable advanced features. Instructions: http://dev.publictransport.tampere.fi/getting-started"""
 
@@ -110,13 +128,29 @@ class Config:
             #     logging.error(f"Value '{v}' cannot be assigned to key '{k}' with value '{original_value}' and will be skipped")
             #     continue
 
-            original_value = getattr(conf, k, None)
-            if original_value is NotDefined:
-                v = Required(v) if v is not None else NotDefined
-            setattr(conf, k, v)
+            setattr(conf, k, Config._parse_value(k, v))
 
         return conf
 
+    @staticmethod
+    def _parse_value(key: str, value: Any) -> Any:
+        """Wrap a value loaded from json into `Required` if the setting is required."""
+        original_value = getattr(Config.default, key, None)
+        if original_value is NotDefined:
+            return Required(value) if value is not None else NotDefined
+        return value
+
+    def with_overrides(self, overrides: dict[str, Any]) -> Config:
+        """Copy of this config with the json `overrides` applied like the values of a loaded config. Raises `ValueError` on unknown settings."""
+        names: set[str] = {f.name for f in fields(Config)}
+        for k in overrides.keys():
+            if k not in names:
+                raise ValueError(f"Unknown setting '{k}' in board overrides.")
+            if k == "boards":
+                raise ValueError("Boards cannot be overridden per board.")
+
+        return replace(self, boards=[], **{k: Config._parse_value(k, v) for k, v in overrides.items()})
+
     @staticmethod
     def save(config: Config, config_path: str) -> None:
         default = Config()
@@ -0,0 +1,59 @@
+import pygame
+
+class DamageRegion:
+    def __init__(self, bounds_size: tuple[int, int], max_waste: float = 0.25) -> None:
+        """
+        Collects the rects changed during a frame and merges them into as few update rects as possible.
+
+        `max_waste` is the largest portion of a merged rect allowed to consist of pixels that were not damaged.
+        """
+        self._bounds: pygame.Rect = pygame.Rect((0, 0), bounds_size)
+        self._max_waste: float = max_waste
+        self._rects: list[pygame.Rect] = []
+        self._coalesced: bool = True
+
+    def add(self, rect: pygame.Rect) -> None:
+        clipped: pygame.Rect = rect.clip(self._bounds)
+        if clipped.width < 1 or clipped.height < 1:
+            return
+
+        self._rects.append(clipped)
+        self._coalesced = False
+
+    def get_rects(self) -> list[pygame.Rect]:
+        if not self._coalesced:
+            self._coalesce()
+        return self._rects
+
+    def get_pixel_count(self) -> int:
+        return sum(r.width * r.height for r in self.get_rects())
+
+    def _should_merge(self, a: pygame.Rect, b: pygame.Rect) -> bool:
+        if a.contains(b) or b.contains(a):
+            return True
+
+        union: pygame.Rect = a.union(b)
+        overlap: pygame.Rect = a.clip(b)
+        damaged: int = (a.width * a.height) + (b.width * b.height) - (overlap.width * overlap.height)
+        union_area: int = union.width * union.height
+        return (union_area - damaged) <= self._max_waste * union_area
+
+    def _coalesce(self) -> None:
+        rects: list[pygame.Rect] = self._rects
+
+        merged: bool = True
+        while merged:
+            merged = False
+            i: int = 0
+            while i < len(rects):
+                j: int = i + 1
+                while j < len(rects):
+                    if self._should_merge(rects[i], rects[j]):
+                        rects[i] = rects[i].union(rects[j])
+                        rects.pop(j)
+                        merged = True
+                    else:
+                        j += 1
+                i += 1
+
+        self._coalesced = True
@@ -2,8 +2,10 @@ from core.debug.fields import set_custom_field as set_custom_field
 from core.debug.fields import get_fields as get_fields
 
 from core.debug import profiler as profiler
+from core.debug import element_timings as element_timings
 
 enabled: bool = False
 process_enabled: bool = False
 rect_enabled: bool = False
 render_enabled: bool = False
+blit_batching_enabled: bool = True
@@ -0,0 +1,112 @@
+from typing import Final as _Final
+from nalpy import math as _math
+from core import logging as _logging
+
+PHASES: _Final[tuple[str, ...]] = ("update", "render", "blit")
+SAMPLE_COUNT: _Final[int] = 120
+
+NANOSECOND_TO_MILLISECOND: _Final[float] = 1 / 1000000
+
+class RingBuffer:
+    def __init__(self, capacity: int) -> None:
+        assert capacity > 0
+        self._values: list[int] = [0] * capacity
+        self._index: int = 0
+        self._count: int = 0
+
+    def append(self, value: int) -> None:
+        self._values[self._index] = value
+        self._index = (self._index + 1) % len(self._values)
+        if self._count < len(self._values):
+            self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def values(self) -> list[int]:
+        """Values in no particular order."""
+        return self._values[:self._count]
+
+class TimingStats:
+    def __init__(self, sorted_values: list[int]) -> None:
+        self.count: int = len(sorted_values)
+        self.p50: float = _percentile(sorted_values, 0.5) * NANOSECOND_TO_MILLISECOND
+        self.p95: float = _percentile(sorted_values, 0.95) * NANOSECOND_TO_MILLISECOND
+        self.max: float = (sorted_values[-1] if len(sorted_values) > 0 else 0) * NANOSECOND_TO_MILLISECOND
+
+def _percentile(sorted_values: list[int], fraction: float) -> int:
+    if len(sorted_values) < 1:
+        return 0
+    index: int = min(_math.ceil(fraction * len(sorted_values)) - 1, len(sorted_values) - 1)
+    return sorted_values[max(index, 0)]
+
+class _ElementTimings:
+    def __init__(self, label: str) -> None:
+        self.label: str = label
+        self.buffers: dict[str, RingBuffer] = {phase: RingBuffer(SAMPLE_COUNT) for phase in PHASES}
+
+    def get_stats(self) -> dict[str, TimingStats]:
+        return {phase: TimingStats(sorted(buffer.values())) for phase, buffer in self.buffers.items()}
+
+_timings: dict[object, _ElementTimings] = {}
+
+_label_prefix: str = ""
+
+def set_label_prefix(prefix: str) -> None:
+    """Prefix the labels of elements recorded after this call. Used to tell apart the elements of different boards."""
+    global _label_prefix
+    _label_prefix = prefix
+
+def _get_label(element: object) -> str:
+    label: str = _label_prefix + type(element).__name__
+    stoptime_index: object = getattr(element, "stoptime_index", None)
+    if stoptime_index is not None:
+        label += f"[{stoptime_index}]"
+    return label
+
+def record(element: object, phase: str, elapsed_ns: int) -> None:
+    timings: _ElementTimings | None = _timings.get(element)
+    if timings is None:
+        timings = _ElementTimings(_get_label(element))
+        _timings[element] = timings
+
+    timings.buffers[phase].append(elapsed_ns)
+
+def get_stats() -> dict[str, dict[str, TimingStats]]:
+    """Timing statistics of every recorded element in milliseconds keyed by element label and phase."""
+    return {t.label: t.get_stats() for t in _timings.values()}
+
+def get_slowest() -> tuple[str, float] | None:
+    """Label and summed p95 of the element with the largest summed p95 over all phases."""
+    slowest: tuple[str, float] | None = None
+    for label, stats in get_stats().items():
+        total_p95: float = sum(s.p95 for s in stats.values())
+        if slowest is None or total_p95 > slowest[1]:
+            slowest = (label, total_p95)
+    return slowest
+
+def get_report() -> str:
+    header: str = f"{'Element':<32}" + "".join(f"{phase + ' p50/p95/max (ms)':>32}" for phase in PHASES)
+    lines: list[str] = [header]
+    for label, stats in sorted(get_stats().items(), key=lambda item: sum(s.p95 for s in item[1].values()), reverse=True):
+        line: str = f"{label:<32}"
+        for phase in PHASES:
+            s = stats[phase]
+            line += f"{f'{s.p50:.3f} / {s.p95:.3f} / {s.max:.3f}':>32}"
+        lines.append(line)
+    return "\n".join(lines)
+
+def export() -> None:
+    message_lines = (
+        "",
+        "I=========================[ EXPORTED ELEMENT TIMINGS ]=========================I",
+        "",
+        get_report(),
+        "",
+        "I=========================[ EXPORTED ELEMENT TIMINGS ]=========================I",
+    )
+
+    _logging.debug("\n".join(message_lines), stack_info=False)
+
+def clear() -> None:
+    _timings.clear()
@@ -1,12 +1,9 @@
 from datetime import date, datetime, time, timedelta, tzinfo
 import json
-import threading
 import pytz
 from typing import Any, Callable, Iterable, NamedTuple, Self
 
-from core import datetime_utils, logging
-
-import requests
+from core import datetime_utils, logging, fetch_loop, http_client
 
 
 EARLIEST_FETCH_DATE: date = date(2021, 1, 1)
@@ -48,23 +45,22 @@ def _valid_timezone(tz: tzinfo | None) -> bool:
     return finland_offset == tz_offset
 
 def get_prices_for_date(date: datetime, on_finish: Callable[[date, tuple[ElectricityPrice | None, ...]], Any]):
-    """Price index determines the starting hour of the given price. The end hour is the next hour from the starting hour. Method fetches the data on a separate thread. All dates are in correlation to the Finnish timezone."""
+    """Price index determines the starting hour of the given price. The end hour is the next hour from the starting hour. Method fetches the data on the fetch loop and calls `on_finish` on the render thread. All dates are in correlation to the Finnish timezone."""
     if not _valid_timezone(date.tzinfo):
         raise ValueError("Invalid timezone.")
 
-    provider = _ElecticityPricesRequestProvider(date.date(), on_finish)
-    request_thread = threading.Thread(target=provider.get_prices_for_date, name=f"ElectricityPricesRequest", daemon=False)
-    request_thread.start()
+    fetch_date = date.date() # `date` is shadowed by the argument
+    provider = _ElecticityPricesRequestProvider(fetch_date)
+    fetch_loop.submit("ElectricityPricesRequest", provider.get_prices_for_date, on_result=lambda prices: on_finish(fetch_date, prices))
 
-class _ElecticityPricesRequestProvider: # HACK: Passing arguments on thread start ignores type checking.
+class _ElecticityPricesRequestProvider:
     _DAY_AHEAD_ENDPOINT: str = "https://api.porssisahko.net/v1/latest-prices.json"
     _PRICE_ENDPOINT_WITH_FORMATTABLE_DATE_AND_HOUR: str = "https://api.porssisahko.net/v1/price.json?date={date}&hour={hour}"
 
-    def __init__(self, fetch_date: date, on_finish: Callable[[date, tuple[ElectricityPrice | None, ...]], Any]) -> None:
+    def __init__(self, fetch_date: date) -> None:
         self.fetch_date: date = fetch_date
-        self.on_finish: Callable[[date, tuple[ElectricityPrice | None, ...]], Any] = on_finish
 
-    def get_prices_for_date(self) -> None:
+    def get_prices_for_date(self) -> tuple[ElectricityPrice | None, ...]:
         """Prices are sorted from old to new. Method is blocking."""
 
         day_ahead_prices: tuple[ElectricityPrice, ...] = tuple(self._fetch_day_ahead_prices())
@@ -76,7 +72,7 @@ class _ElecticityPricesRequestProvider: # HACK: Passing arguments on thread star
                 logging.debug(f"Fetching single hour data for hour: {hour}", stack_info=False)
                 prices[hour] = self._fetch_price(self.fetch_date, hour)
 
-        self.on_finish(self.fetch_date, tuple(prices))
+        return tuple(prices)
 
     @staticmethod
     def _get_prices(day_ahead_prices: tuple[ElectricityPrice, ...], date: date) -> list[ElectricityPrice | None]:
@@ -100,7 +96,7 @@ class _ElecticityPricesRequestProvider: # HACK: Passing arguments on thread star
         prices_json: str | None = None
         retries: int = 0
         while prices_json is None:
-            resp = requests.get(_ElecticityPricesRequestProvider._DAY_AHEAD_ENDPOINT)
+            resp = http_client.get(_ElecticityPricesRequestProvider._DAY_AHEAD_ENDPOINT)
             if resp.ok:
                 prices_json = resp.text
             else:
@@ -124,7 +120,7 @@ class _ElecticityPricesRequestProvider: # HACK: Passing arguments on thread star
         price_json: str | None = None
         retries: int = 0
         while price_json is None:
-            resp = requests.get(endpoint)
+            resp = http_client.get(endpoint)
             if resp.status_code == 404:
                 return None
 
@@ -1,9 +1,73 @@
-from typing import final
+from typing import NamedTuple, final
 import pygame
 from core import config
 
 _instanciated: bool = False
 
+_MAX_CACHED_SPLITS: int = 8
+
+class _Layout(NamedTuple):
+    display_size: tuple[int, int]
+    departure_count: int
+
+    content_width: int
+    content_offset: int
+    content_spacing: int
+
+    header_rect: pygame.Rect
+    stop_info_rect: pygame.Rect
+    footer_rect: pygame.Rect
+    embed_rect: pygame.Rect
+    stoptime_rects: tuple[pygame.Rect, ...]
+
+    stoptime_shortname_headsign_split_x: int
+
+    headsign_time_split_x: dict[pygame.font.Font, int]
+    """Lazily filled, keyed by time font."""
+
+def _get_stoptime_rect(stop_info_rect: pygame.Rect, content_spacing: int, content_offset: int, content_width: int, stoptime_index: int) -> pygame.Rect:
+    stoptime_height: int = stop_info_rect.height
+    stoptime_y_raw: float = stop_info_rect.bottom + content_spacing + stoptime_index * ((content_spacing / 2) + stoptime_height)
+    stoptime_y: int = int(stoptime_y_raw)
+    return pygame.Rect(content_offset, stoptime_y, content_width, stoptime_height)
+
+def _compute_layout(display_size: tuple[int, int], departure_count: int) -> _Layout:
+    content_width: int = display_size[0] - (display_size[0] // 8)
+    content_offset: int = (display_size[0] - content_width) // 2
+    content_spacing: int = round(content_offset * 0.3)
+
+    header_rect: pygame.Rect = pygame.Rect(content_offset, content_offset, content_width, display_size[0] / 13)
+    stop_info_rect: pygame.Rect = pygame.Rect(content_offset, header_rect.bottom + content_spacing * 2, content_width, display_size[0] / 9)
+
+    footer_height: int = int(display_size[0] / 13)
+    footer_y: int = display_size[1] - content_offset - footer_height
+    footer_rect: pygame.Rect = pygame.Rect(content_offset, footer_y, content_width, footer_height)
+
+    stoptime_rects: tuple[pygame.Rect, ...] = tuple(_get_stoptime_rect(stop_info_rect, content_spacing, content_offset, content_width, i) for i in range(departure_count))
+
+    last_stoptime_rect: pygame.Rect = _get_stoptime_rect(stop_info_rect, content_spacing, content_offset, content_width, departure_count - 1)
+    embed_y: int = round(last_stoptime_rect.y) + last_stoptime_rect.height + (2 * content_spacing)
+    embed_height: int = footer_rect.y - embed_y - content_spacing
+    embed_rect: pygame.Rect = pygame.Rect(0, embed_y, display_size[0], embed_height)
+
+    first_stoptime_rect: pygame.Rect = _get_stoptime_rect(stop_info_rect, content_spacing, content_offset, content_width, 0)
+    stoptime_shortname_headsign_split_x: int = first_stoptime_rect.left + first_stoptime_rect.width // 5
+
+    return _Layout(
+        display_size=display_size,
+        departure_count=departure_count,
+        content_width=content_width,
+        content_offset=content_offset,
+        content_spacing=content_spacing,
+        header_rect=header_rect,
+        stop_info_rect=stop_info_rect,
+        footer_rect=footer_rect,
+        embed_rect=embed_rect,
+        stoptime_rects=stoptime_rects,
+        stoptime_shortname_headsign_split_x=stoptime_shortname_headsign_split_x,
+        headsign_time_split_x={}
+    )
+
 @final
 class ElementPositionParams:
     def __init__(self) -> None:
@@ -12,56 +76,90 @@ class ElementPositionParams:
             raise RuntimeError(f"{type(self).__name__} is a single-instance class reserved for elements module.")
         _instanciated = True
 
+        self._display_size: tuple[int, int] | None = None
+        self._layout: _Layout | None = None
+
+    def set_display_size(self, size: tuple[int, int]) -> None:
+        """Set by the renderer whenever the size of the display surface changes. Invalidates the layout if the size is different."""
+        size = (size[0], size[1])
+        if size != self._display_size:
+            self._display_size = size
+            self._layout = None
+
+    def invalidate(self) -> None:
+        """Recompute the layout on next access."""
+        self._layout = None
+
+    def get_state(self) -> tuple[tuple[int, int] | None, _Layout | None]:
+        """Display size and layout. Swapped by the renderer when rendering multiple boards."""
+        return (self._display_size, self._layout)
+
+    def set_state(self, state: tuple[tuple[int, int] | None, _Layout | None]) -> None:
+        self._display_size, self._layout = state
+
+    def _get_layout(self) -> _Layout:
+        layout: _Layout | None = self._layout
+        departure_count: int = config.current.departure_count
+        if layout is None or layout.departure_count != departure_count:
+            layout = _compute_layout(self.display_size, departure_count)
+            self._layout = layout
+        return layout
+
     @property
     def display_size(self) -> tuple[int, int]:
         # Should be the same as renderer.get_size()
         # which cannot be called due to it creating a circular import.
-        return pygame.display.get_window_size()
+        if self._display_size is None:
+            raise RuntimeError("Display size has not been set by the renderer.")
+        return self._display_size
 
     @property
     def content_width(self) -> int:
-        return self.display_size[0] - (self.display_size[0] // 8)
+        return self._get_layout().content_width
 
     @property
     def content_offset(self) -> int:
-        return (self.display_size[0] - self.content_width) // 2
+        return self._get_layout().content_offset
 
     @property
     def content_spacing(self):
-        return round(self.content_offset * 0.3)
+        return self._get_layout().content_spacing
+
+    # Rects are copied so that callers cannot modify the cached layout.
 
     @property
     def header_rect(self) -> pygame.Rect:
-        return pygame.Rect(self.content_offset, self.content_offset, self.content_width, self.display_size[0] / 13)
+        return self._get_layout().header_rect.copy()
 
     @property
     def stop_info_rect(self) -> pygame.Rect:
-        return pygame.Rect(self.content_offset, self.header_rect.bottom + self.content_spacing * 2, self.content_width, self.display_size[0] / 9)
+        return self._get_layout().stop_info_rect.copy()
 
     @property
     def footer_rect(self) -> pygame.Rect:
-        footer_height: int = int(self.display_size[0] / 13)
-        footer_y: int = self.display_size[1] - self.content_offset - footer_height
-        return pygame.Rect(self.content_offset, footer_y, self.content_width, footer_height)
+        return self._get_layout().footer_rect.copy()
 
     @property
     def embed_rect(self) -> pygame.Rect:
-        last_stoptime_rect: pygame.Rect = self.get_stoptime_rect(config.current.departure_count - 1)
-        embed_y: int = round(last_stoptime_rect.y) + last_stoptime_rect.height + (2 * self.content_spacing)
-        embed_height: int = self.footer_rect.y - embed_y - self.content_spacing
-        return pygame.Rect(0, embed_y, self.display_size[0], embed_height)
+        return self._get_layout().embed_rect.copy()
 
     def get_stoptime_rect(self, stoptime_index: int) -> pygame.Rect:
-        stoptime_height: int = self.stop_info_rect.height
-        stoptime_y_raw: float = self.stop_info_rect.bottom + self.content_spacing + stoptime_index * ((self.content_spacing / 2) + stoptime_height)
-        stoptime_y: int = int(stoptime_y_raw)
-        return pygame.Rect(self.content_offset, stoptime_y, self.content_width, stoptime_height)
+        layout: _Layout = self._get_layout()
+        if 0 <= stoptime_index < len(layout.stoptime_rects):
+            return layout.stoptime_rects[stoptime_index].copy()
+        return _get_stoptime_rect(layout.stop_info_rect, layout.content_spacing, layout.content_offset, layout.content_width, stoptime_index)
 
     def get_stoptime_headsign_time_split_x(self, time_font: pygame.font.Font) -> int:
-        stoptime_rect = self.get_stoptime_rect(0)
-        return stoptime_rect.right - time_font.size("00:00")[0] # 0 should be the widest number in Lato font
+        layout: _Layout = self._get_layout()
+        split_x: int | None = layout.headsign_time_split_x.get(time_font)
+        if split_x is None:
+            stoptime_rect = self.get_stoptime_rect(0)
+            split_x = stoptime_rect.right - time_font.size("00:00")[0] # 0 should be the widest number in Lato font
+            if len(layout.headsign_time_split_x) >= _MAX_CACHED_SPLITS: # Fonts are reloaded if their size changes
+                layout.headsign_time_split_x.clear()
+            layout.headsign_time_split_x[time_font] = split_x
+        return split_x
 
     @property
     def stoptime_shortname_headsign_split_x(self) -> int:
-        stoptime_rect = self.get_stoptime_rect(0)
-        return stoptime_rect.left + stoptime_rect.width // 5
+        return self._get_layout().stoptime_shortname_headsign_split_x
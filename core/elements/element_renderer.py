@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 import pygame
 
@@ -16,6 +17,13 @@ class ElementRenderer(ABC):
         """Called repeatedly to refresh this element's data. Return `True` to render this element with the updated data."""
         raise NotImplementedError()
 
+    def get_next_update(self, now: datetime) -> datetime | None:
+        """
+        The earliest time when `update` might return `True` without new data arriving from other threads.
+        Return `None` if this element only changes when new data arrives.
+        """
+        return None
+
     @abstractmethod
     def get_rect(self) -> pygame.Rect:
         """Compute the global rect of this element."""
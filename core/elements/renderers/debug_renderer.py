@@ -1,9 +1,11 @@
 import os
 import threading
+from datetime import datetime, timedelta
 import psutil
 import pygame
-from core import debug, elements, renderer
+from core import debug, elements, renderer, frame_scheduler, surface_pool, font_helper, textures, embed_worker, http_client, fetch_loop
 from core.colors import Colors
+import digitransit.routing
 
 class DebugRenderer(elements.ElementRenderer):
     def __init__(self) -> None:
@@ -28,6 +30,11 @@ class DebugRenderer(elements.ElementRenderer):
 
         return self.debug or self.last_debug # Last debug ensures one call after debug is disabled
 
+    def get_next_update(self, now: datetime) -> datetime | None:
+        if debug.enabled or self.last_debug:
+            return now + timedelta(seconds=0.25)
+        return None
+
     def _prepare_fields(self) -> list[str]:
         memory_usage_msg: str = "disabled"
         thread_count_msg: str = "disabled"
@@ -42,9 +49,51 @@ class DebugRenderer(elements.ElementRenderer):
                 thread_fields.append((f"    {thread.name}", thread.ident))
             thread_count_msg = str(len(thread_fields))
 
+        idle_fraction: float | None = frame_scheduler.get_idle_fraction()
+        idle_msg: str = f"{idle_fraction * 100:.1f} %" if idle_fraction is not None else "N/A"
+        wakeups_msg: str = ", ".join(f"{reason}: {count}" for reason, count in frame_scheduler.get_wakeups().items())
+
+        slowest: tuple[str, float] | None = debug.element_timings.get_slowest()
+        slowest_msg: str = f"{slowest[0]} ({slowest[1]:.2f} ms p95)" if slowest is not None else "N/A"
+
+        pool_hits, pool_misses, pool_free = surface_pool.get_stats()
+        pool_msg: str = f"{pool_hits} hits, {pool_misses} misses, {pool_free} free"
+
+        font_loads_msg: str = str(sum(font_helper.get_load_counts().values()))
+        text_hits, text_misses, text_bytes = font_helper.get_text_cache_stats()
+        text_cache_msg: str = f"{text_hits / max(text_hits + text_misses, 1) * 100:.1f} % hits, {text_bytes / 1_048_576:.2f} MB"
+
+        texture_usage: dict[str, int] = textures.get_memory_usage()
+        textures_msg: str = f"{len(texture_usage)} ({sum(texture_usage.values()) / 1_048_576:.2f} MB)"
+
+        worker_queue, worker_latency, worker_render = embed_worker.get_stats()
+        embed_worker_msg: str = f"{worker_queue} queued, {worker_latency.p50:.1f} ms latency p50, {worker_render.p50:.1f} ms render p50"
+
+        fetches_in_flight, fetches_completed, fetches_failed = fetch_loop.get_stats()
+        fetches_msg: str = f"{fetches_in_flight} in flight, {fetches_completed} completed, {fetches_failed} failed"
+
+        reused_responses, reusable_requests = digitransit.routing.get_response_reuse_stats()
+        unchanged_polls_msg: str = f"{reused_responses / max(reusable_requests, 1) * 100:.1f} % ({reused_responses}/{reusable_requests})"
+
+        http_fields: list[tuple[str, object]] = []
+        for host, (request_count, failure_count, bytes_received, latency) in http_client.get_stats().items():
+            http_fields.append((f"    {host}", f"{request_count} requests ({failure_count} failed), {bytes_received / 1024:.1f} KB, {latency:.0f} ms p50"))
+
         fields: list[tuple[str, object]] = debug.get_fields(
             ("Frametime", f"{renderer.get_frametime(3):.2f} ms"),
             ("Raw Frametime", f"{renderer.get_raw_frametime(3):.2f} ms"),
+            ("Idle", idle_msg),
+            ("Wakeups", wakeups_msg),
+            ("Slowest Element", slowest_msg),
+            ("Surface Pool", pool_msg),
+            ("Font Loads", font_loads_msg),
+            ("Text Cache", text_cache_msg),
+            ("Textures", textures_msg),
+            ("Embed Worker", embed_worker_msg),
+            ("Fetches", fetches_msg),
+            ("Unchanged Polls", unchanged_polls_msg),
+            ("HTTP Hosts", len(http_fields)),
+            *http_fields,
             ("Memory Usage", memory_usage_msg),
             (f"Threads", thread_count_msg),
             *thread_fields
@@ -76,10 +125,10 @@ class DebugRenderer(elements.ElementRenderer):
         else:
             flags.clear_background = False
 
-        surf: pygame.Surface = pygame.Surface(size)
+        surf: pygame.Surface = surface_pool.borrow(size)
 
         for i, field in enumerate(self.render_fields):
-            rendered_field: pygame.Surface = self.font.render(field, True, Colors.WHITE)
+            rendered_field: pygame.Surface = self.font.render(field, True, Colors.WHITE) # Not cached as the fields change every frame
             surf.blit(rendered_field, (0, i * self.font.get_linesize()))
 
         return surf
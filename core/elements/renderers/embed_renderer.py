@@ -1,4 +1,5 @@
 import dataclasses
+from datetime import datetime
 from types import EllipsisType
 import pygame
 from core import elements, render_info
@@ -17,9 +18,10 @@ class EmbedRenderer(elements.ElementRenderer):
     def update(self, context: elements.UpdateContext) -> bool:
         changes: bool = False
 
-        with render_info.current_embed_data_lock: # TODO: Non blocking check
-            if render_info.current_embed_data is not self.embed_data: # Handles None check
-                self.embed_data = render_info.current_embed_data
+        embed_cycle: render_info.EmbedCycle = render_info.active.embed_cycle
+        with embed_cycle.current_embed_data_lock: # TODO: Non blocking check
+            if embed_cycle.current_embed_data is not self.embed_data: # Handles None check
+                self.embed_data = embed_cycle.current_embed_data
                 changes = True
 
 
@@ -41,6 +43,18 @@ class EmbedRenderer(elements.ElementRenderer):
 
         return changes
 
+    def get_next_update(self, now: datetime) -> datetime | None:
+        embed_data: render_info.CurrentEmbedData | None = self.embed_data
+        if embed_data is None:
+            return None
+
+        raw_progress: float = (now.timestamp() - embed_data.enabled_posix_timestamp) / embed_data.requested_duration
+        next_progress: float | None = embed_data.embed.get_next_progress_update(raw_progress)
+        if next_progress is None:
+            return None
+
+        return datetime.fromtimestamp(embed_data.enabled_posix_timestamp + next_progress * embed_data.requested_duration)
+
     def get_rect(self) -> pygame.Rect:
         embed_rect: pygame.Rect = elements.position_params.embed_rect
         if embed_rect.width < 0 or embed_rect.height < 0:
@@ -1,13 +1,14 @@
 import pygame
-from core import elements, font_helper
+from core import elements, font_helper, surface_pool, textures
 from core.colors import Colors
 
+FOOTER_PICTOGRAMS_PATH: str = "resources/textures/elements/footer/footer_pictograms.png"
+
 class FooterRenderer(elements.ElementRenderer):
     def update(self, context: elements.UpdateContext) -> bool:
         return False
 
     def setup(self) -> None:
-        self.unscaled_footer_pictograms: pygame.Surface = pygame.image.load("resources/textures/elements/footer/footer_pictograms.png").convert_alpha()
         self.nyssefi_font: font_helper.SizedFont = font_helper.SizedFont("resources/fonts/Lota-Grotesque-Bold.otf")
 
     def get_rect(self) -> pygame.Rect:
@@ -15,14 +16,11 @@ class FooterRenderer(elements.ElementRenderer):
 
     def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
         nyssefi_font_height: int = size[1]
-        nyssefi_text = self.nyssefi_font.get_size(nyssefi_font_height).render("nysse.fi", True, Colors.WHITE)
+        nyssefi_text = font_helper.render_text(self.nyssefi_font.get_size(nyssefi_font_height), "nysse.fi", True, Colors.WHITE)
 
-        unscaled_pictograms: pygame.Surface = self.unscaled_footer_pictograms
-        footer_pictograms_height: float = size[1] * 0.7
-        footer_pictograms_width: float = unscaled_pictograms.get_width() / unscaled_pictograms.get_height() * footer_pictograms_height
-        footer_pictograms = pygame.transform.smoothscale(unscaled_pictograms, (round(footer_pictograms_width), round(footer_pictograms_height)))
+        footer_pictograms = textures.get_scaled_to_height(FOOTER_PICTOGRAMS_PATH, round(size[1] * 0.7))
 
-        surf = pygame.Surface(size, pygame.SRCALPHA)
+        surf = surface_pool.borrow(size, pygame.SRCALPHA)
 
         pictograms_x = size[0] - footer_pictograms.get_width()
         surf.blit(footer_pictograms, (pictograms_x, size[1] // 2 - footer_pictograms.get_height() // 2))
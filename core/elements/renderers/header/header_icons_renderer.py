@@ -26,8 +26,4 @@ class HeaderIconsRenderer(elements.ElementRenderer):
 
     def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
         assert self.vehicle_mode is not None, "Update should have assigned vehicle_mode already."
-        transport_icon = nysse.styles.load_pictogram_by_mode(self.vehicle_mode)
-        if transport_icon is not None:
-            transport_icon = pygame.transform.smoothscale(transport_icon, (size[1], size[1])).convert_alpha()
-
-        return transport_icon
+        return nysse.styles.load_pictogram_by_mode(self.vehicle_mode, size=(size[1], size[1]))
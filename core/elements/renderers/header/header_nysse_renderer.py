@@ -1,12 +1,14 @@
 import pygame
-from core import elements
+from core import elements, surface_pool, textures
+
+NYSSE_LOGO_PATH: str = "resources/textures/logos/nysse/logo.png"
 
 class HeaderNysseRenderer(elements.ElementRenderer):
     def update(self, context: elements.UpdateContext) -> bool:
         return False
 
     def setup(self) -> None:
-        self.nysse_logo_unscaled: pygame.Surface = pygame.image.load("resources/textures/logos/nysse/logo.png").convert_alpha()
+        pass
 
     def get_rect(self) -> pygame.Rect:
         header_rect: pygame.Rect = elements.position_params.header_rect
@@ -20,14 +22,9 @@ class HeaderNysseRenderer(elements.ElementRenderer):
         return pygame.Rect(x, y, w, h)
 
     def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
-        unscaled_logo = self.nysse_logo_unscaled
-
-        target_height: int = size[1]
-        target_width: int = round((unscaled_logo.get_width() / unscaled_logo.get_height()) * target_height)
-
-        nysse_logo = pygame.transform.smoothscale(unscaled_logo, (target_width, target_height))
+        nysse_logo = textures.get_scaled_to_height(NYSSE_LOGO_PATH, size[1])
 
-        surf = pygame.Surface(size, pygame.SRCALPHA)
+        surf = surface_pool.borrow(size, pygame.SRCALPHA)
         surf.blit(nysse_logo, (0, size[1] // 2 - nysse_logo.get_height() // 2))
 
         return surf
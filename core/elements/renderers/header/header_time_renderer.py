@@ -1,6 +1,6 @@
-from datetime import time
+from datetime import datetime, time, timedelta
 import pygame
-from core import elements, font_helper
+from core import elements, font_helper, surface_pool
 from core.colors import Colors
 
 class HeaderTimeRenderer(elements.ElementRenderer):
@@ -25,6 +25,9 @@ class HeaderTimeRenderer(elements.ElementRenderer):
 
         return changes
 
+    def get_next_update(self, now: datetime) -> datetime | None:
+        return now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+
     def get_rect(self) -> pygame.Rect:
         header_rect: pygame.Rect = elements.position_params.header_rect
 
@@ -38,9 +41,17 @@ class HeaderTimeRenderer(elements.ElementRenderer):
 
     def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
         time_str: str = self.time.strftime(elements.TIMEFORMAT)
-        time: pygame.Surface = self.font.get_size(size[1]).render(time_str, True, Colors.WHITE)
-
-        surf: pygame.Surface = pygame.Surface(size, pygame.SRCALPHA)
-        surf.blit(time, (size[0] - time.get_width(), size[1] - time.get_height())) # Height aligned from bottom because font has whitespace above each letter
+        font: pygame.font.Font = self.font.get_size(size[1])
+
+        surf: pygame.Surface = surface_pool.borrow(size, pygame.SRCALPHA)
+
+        # Height aligned from bottom because font has whitespace above each letter
+        atlas: font_helper.GlyphAtlas = font_helper.get_glyph_atlas(font, Colors.WHITE)
+        if atlas.can_render(time_str):
+            time_w, time_h = atlas.size(time_str)
+            atlas.blit(surf, time_str, (size[0] - time_w, size[1] - time_h))
+        else:
+            time: pygame.Surface = font_helper.render_text(font, time_str, True, Colors.WHITE)
+            surf.blit(time, (size[0] - time.get_width(), size[1] - time.get_height()))
 
         return surf
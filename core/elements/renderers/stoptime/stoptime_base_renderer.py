@@ -1,12 +1,26 @@
 from abc import abstractmethod
 from datetime import datetime
-from core import elements, logging
+import pygame
+from core import elements, logging, debug, surface_pool
 import digitransit.routing
 
+_reused_row_renders: int = 0
+
 class StoptimeBaseRenderer(elements.ElementRenderer):
     def __init__(self, stoptime_index: int) -> None:
         self.stoptime_index: int = stoptime_index
         self.value: str = "<error>"
+        self.stoptime: digitransit.routing.Stoptime | None = None
+        self._value_expiry: datetime | None = None
+        """When `value` next changes for the current `stoptime`. `None` if it only changes with the stoptime."""
+
+        self._last_render: pygame.Surface | None = None
+        self._last_render_key: tuple[str, str] | None = None
+        """Trip gtfsId and value of `_last_render`."""
+        self._adopted_render: pygame.Surface | None = None
+
+        self.next_row: StoptimeBaseRenderer | None = None
+        """Renderer of the same column on the row below. Linked when the renderers are created."""
 
     def get_font_height(self, full_height: int) -> int:
         return round((2 / 3) * full_height)
@@ -19,22 +33,96 @@ class StoptimeBaseRenderer(elements.ElementRenderer):
     def get_value(self, stoptime: digitransit.routing.Stoptime, current_time: datetime) -> str:
         raise NotImplementedError()
 
+    def get_value_expiry(self, stoptime: digitransit.routing.Stoptime, current_time: datetime) -> datetime | None:
+        """
+        The time when `get_value` next returns a different value for the same stoptime.
+        Return `None` if the value does not depend on time.
+        """
+        return None
+
     @abstractmethod
     def get_error_value(self) -> str:
         raise NotImplementedError()
 
+    def get_next_update(self, now: datetime) -> datetime | None:
+        if self._value_expiry is None:
+            return None
+        return max(self._value_expiry, now)
+
+    @abstractmethod
+    def render_row(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface:
+        """Render `value` onto a surface borrowed from `surface_pool`. Should not modify the state of this element."""
+        raise NotImplementedError()
+
+    def _get_render_key(self) -> tuple[str, str] | None:
+        if self.stoptime is None or self.stoptime.trip is None:
+            return None
+        return (self.stoptime.trip.gtfsId, self.value)
+
+    def _adopt_next_row_render(self) -> None:
+        """When departures shift up by a row, take the render of the row below instead of rendering the same value again."""
+        if self._adopted_render is not None:
+            surface_pool.release(self._adopted_render)
+            self._adopted_render = None
+
+        key: tuple[str, str] | None = self._get_render_key()
+        if key is None:
+            return
+
+        next_row: StoptimeBaseRenderer | None = self.next_row
+        if next_row is None or next_row._last_render is None or next_row._last_render_key != key:
+            return
+
+        self._adopted_render = next_row._last_render
+        surface_pool.retain(self._adopted_render) # The next row releases its reference when it renders again
+
+    def _keep_render(self, render: pygame.Surface) -> None:
+        surface_pool.retain(render)
+        if self._last_render is not None:
+            surface_pool.release(self._last_render)
+        self._last_render = render
+        self._last_render_key = self._get_render_key()
+
+    def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
+        global _reused_row_renders
+
+        render: pygame.Surface | None = self._adopted_render
+        self._adopted_render = None
+        if render is not None and render.get_size() != size:
+            surface_pool.release(render)
+            render = None
+
+        if render is not None:
+            _reused_row_renders += 1
+            debug.set_custom_field("stoptime_reused_rows", "Reused Stoptime Renders", _reused_row_renders)
+        else:
+            render = self.render_row(size, flags)
+
+        # The adopted reference is handed to the renderer which releases it after drawing
+        self._keep_render(render)
+        return render
+
     def update(self, context: elements.UpdateContext) -> bool:
         changes: bool = False
 
         new_value: str
         try:
-            new_value = self.get_value(self._get_stoptime(context), context.time)
+            stoptime: digitransit.routing.Stoptime = self._get_stoptime(context)
+            if stoptime is self.stoptime and (self._value_expiry is None or context.time < self._value_expiry):
+                return False # Value is still valid
+
+            self.stoptime = stoptime
+            new_value = self.get_value(stoptime, context.time)
+            self._value_expiry = self.get_value_expiry(stoptime, context.time)
         except Exception as e:
             logging.error(e)
+            self.stoptime = None
+            self._value_expiry = None
             new_value = self.get_error_value()
 
         if self.value != new_value:
             self.value = new_value
             changes = True
+            self._adopt_next_row_render()
 
         return changes
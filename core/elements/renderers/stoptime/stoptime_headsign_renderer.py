@@ -1,6 +1,6 @@
 from datetime import datetime
 import pygame
-from core import elements, font_helper, colors
+from core import elements, font_helper, colors, surface_pool
 import digitransit.routing
 
 class StoptimeHeadsignRenderer(elements.StoptimeBaseRenderer):
@@ -32,11 +32,11 @@ class StoptimeHeadsignRenderer(elements.StoptimeBaseRenderer):
 
         return pygame.Rect(left, stoptime_rect.top, width, height)
 
-    def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
+    def render_row(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface:
         font_height: int = self.get_font_height(size[1])
-        line_headsign_render = self.font.get_size(round(font_height * 0.9)).render(self.value, True, colors.Colors.WHITE)
+        line_headsign_render = font_helper.render_text(self.font.get_size(round(font_height * 0.9)), self.value, True, colors.Colors.WHITE)
 
-        surf = pygame.Surface(size, pygame.SRCALPHA)
+        surf = surface_pool.borrow(size, pygame.SRCALPHA)
 
         line_number_height: int = self.shortname_renderer.font.get_size(font_height).get_height()
         surf.blit(line_headsign_render, (0, size[1] // 2 + line_number_height // 2 - line_headsign_render.get_height()))
@@ -1,6 +1,6 @@
 from datetime import datetime
 import pygame
-from core import elements, font_helper, colors
+from core import elements, font_helper, colors, surface_pool
 import digitransit.routing
 
 class StoptimeShortnameRenderer(elements.StoptimeBaseRenderer):
@@ -22,11 +22,11 @@ class StoptimeShortnameRenderer(elements.StoptimeBaseRenderer):
 
         return pygame.Rect(stoptime_rect.topleft, (w, stoptime_rect.height))
 
-    def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
-        surf = pygame.Surface(size, pygame.SRCALPHA)
+    def render_row(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface:
+        surf = surface_pool.borrow(size, pygame.SRCALPHA)
 
         font_height: int = self.get_font_height(size[1])
-        line_number_render = self.font.get_size(font_height).render(self.value, True, colors.Colors.WHITE)
+        line_number_render = font_helper.render_text(self.font.get_size(font_height), self.value, True, colors.Colors.WHITE)
 
         surf.blit(line_number_render, (0, size[1] // 2 - line_number_render.get_height() // 2))
 
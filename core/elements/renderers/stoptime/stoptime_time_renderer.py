@@ -1,26 +1,42 @@
-from datetime import datetime
+import math
+from datetime import datetime, timedelta
 import pygame
-from core import elements, font_helper, colors
+from core import elements, font_helper, colors, surface_pool
 from digitransit.enums import RealtimeState
 import digitransit.routing
 
 CANCELLED_PREFIX: str = "!!CANCELLED_"
 
+_EXPIRY_EPSILON: timedelta = timedelta(milliseconds=1)
+"""Expire just after the rounding boundary so that the value has changed when it is recomputed."""
+
 class StoptimeTimeRenderer(elements.StoptimeBaseRenderer):
     def setup(self) -> None:
         self.font: font_helper.SizedFont = font_helper.SizedFont("resources/fonts/Lato-Bold.ttf")
 
-    def get_value(self, stoptime: digitransit.routing.Stoptime, current_time: datetime) -> str:
+    @staticmethod
+    def _get_departure(stoptime: digitransit.routing.Stoptime) -> datetime:
         assert stoptime.realtimeDeparture is not None and stoptime.scheduledDeparture is not None
-        departure: datetime = stoptime.realtimeDeparture if stoptime.realtime == True else stoptime.scheduledDeparture
+        return stoptime.realtimeDeparture if stoptime.realtime == True else stoptime.scheduledDeparture
+
+    @staticmethod
+    def _is_countdown(stoptime: digitransit.routing.Stoptime) -> bool:
+        return stoptime.realtime == True and stoptime.realtimeState not in (RealtimeState.SCHEDULED, RealtimeState.CANCELED)
+
+    @staticmethod
+    def _get_countdown_minutes(departure: datetime, current_time: datetime) -> int:
+        departure_diff = departure - current_time
+        # Halves are rounded up (unlike round() which rounds them to even) so that get_value_expiry can compute the boundary exactly
+        diff_minutes: int = math.floor(departure_diff.total_seconds() / 60 + 0.5)
+        return max(diff_minutes, 0)
+
+    def get_value(self, stoptime: digitransit.routing.Stoptime, current_time: datetime) -> str:
+        departure: datetime = self._get_departure(stoptime)
 
         # Formatting
         departure_time_text: str
-        if stoptime.realtime == True and stoptime.realtimeState not in (RealtimeState.SCHEDULED, RealtimeState.CANCELED):
-            departure_diff = departure - current_time
-            diff_minutes: int = round(departure_diff.total_seconds() / 60)
-            diff_minutes = max(diff_minutes, 0)
-            departure_time_text = str(diff_minutes)
+        if self._is_countdown(stoptime):
+            departure_time_text = str(self._get_countdown_minutes(departure, current_time))
         else:
             departure_time_text = departure.strftime(elements.TIMEFORMAT)
 
@@ -30,6 +46,18 @@ class StoptimeTimeRenderer(elements.StoptimeBaseRenderer):
 
         return departure_time_text
 
+    def get_value_expiry(self, stoptime: digitransit.routing.Stoptime, current_time: datetime) -> datetime | None:
+        if not self._is_countdown(stoptime):
+            return None
+
+        departure: datetime = self._get_departure(stoptime)
+        minutes: int = self._get_countdown_minutes(departure, current_time)
+        if minutes < 1: # Countdown is clamped to zero
+            return None
+
+        # Countdown is rounded so it decreases once the remaining time drops below the next half minute
+        return departure - timedelta(minutes=minutes - 0.5) + _EXPIRY_EPSILON
+
     def get_error_value(self) -> str:
         return "<error>"
 
@@ -44,29 +72,40 @@ class StoptimeTimeRenderer(elements.StoptimeBaseRenderer):
 
         return pygame.Rect(x, stoptime_rect.top, w, height)
 
-    def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
+    def render_row(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface:
         cancelled: bool = False
         time_str: str = self.value
         if time_str.startswith(CANCELLED_PREFIX):
             cancelled = True
-            time_str.removeprefix(CANCELLED_PREFIX)
+            time_str = time_str.removeprefix(CANCELLED_PREFIX) # Only the time is shown, struck through below
 
         font_height: int = self.get_font_height(size[1])
-        departure_time_render = self.font.get_size(font_height).render(time_str, True, colors.Colors.WHITE)
+        font: pygame.font.Font = self.font.get_size(font_height)
+
+        surf = surface_pool.borrow(size, pygame.SRCALPHA)
+
+        # Countdowns and clock times are composed from atlas cells. Error values are rendered normally.
+        atlas: font_helper.GlyphAtlas = font_helper.get_glyph_atlas(font, colors.Colors.WHITE)
+        departure_time_rect: pygame.Rect
+        if atlas.can_render(time_str):
+            departure_time_rect = pygame.Rect((0, 0), atlas.size(time_str))
+            departure_time_rect.topleft = (size[0] - departure_time_rect.width, size[1] // 2 - departure_time_rect.height // 2)
+            atlas.blit(surf, time_str, departure_time_rect.topleft)
+        else:
+            departure_time_render = font_helper.render_text(font, time_str, True, colors.Colors.WHITE)
+            departure_time_rect = departure_time_render.get_rect()
+            departure_time_rect.topleft = (size[0] - departure_time_rect.width, size[1] // 2 - departure_time_rect.height // 2)
+            surf.blit(departure_time_render, departure_time_rect.topleft)
 
         # render strikethrough if canceled.
         if cancelled:
-            departure_time_size = departure_time_render.get_size()
-            strikethrough_y = round(departure_time_size[1] / 2)
-            strikethrough_thickness = max(round(departure_time_size[1] / 14), 1)
+            strikethrough_y = departure_time_rect.top + round(departure_time_rect.height / 2)
+            strikethrough_thickness = max(round(departure_time_rect.height / 14), 1)
             pygame.draw.line(
-                departure_time_render, colors.Colors.WHITE,
-                (0, strikethrough_y), (departure_time_size[0], strikethrough_y),
+                surf, colors.Colors.WHITE,
+                (departure_time_rect.left, strikethrough_y), (departure_time_rect.right, strikethrough_y),
                 strikethrough_thickness
             )
         #endregion
 
-        surf = pygame.Surface(size, pygame.SRCALPHA)
-        surf.blit(departure_time_render, (size[0] - departure_time_render.get_width(), size[1] // 2 - departure_time_render.get_height() // 2))
-
         return surf
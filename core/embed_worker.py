@@ -0,0 +1,141 @@
+import os as _os
+import multiprocessing as _multiprocessing
+import threading as _threading
+from concurrent.futures import Future as _Future
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool as _BrokenProcessPool
+from time import perf_counter_ns as _perf_counter_ns
+from typing import Any as _Any
+from typing import Callable as _Callable
+from typing import Hashable as _Hashable
+from typing import NamedTuple as _NamedTuple
+import pygame as _pygame
+from core import logging as _logging
+from core import frame_scheduler as _frame_scheduler
+from core.debug import element_timings as _element_timings
+
+_MAX_WORKERS: int = 1
+"""A single worker keeps a core free for the render thread on a Raspberry Pi."""
+
+class _Pending:
+    def __repr__(self) -> str:
+        return "PENDING"
+
+PENDING: _Any = _Pending()
+"""Returned by `poll` while the job is still running."""
+
+class _SurfaceData(_NamedTuple):
+    pixels: bytes
+    size: tuple[int, int]
+    format: str
+
+class _Job(_NamedTuple):
+    future: _Future
+    submitted_ns: int
+
+_executor: _ProcessPoolExecutor | None = None
+_jobs: dict[_Hashable, _Job] = {}
+_jobs_lock: _threading.Lock = _threading.Lock()
+"""Jobs are polled on the render thread but can be discarded from the embed cycle thread."""
+
+_latencies: _element_timings.RingBuffer = _element_timings.RingBuffer(_element_timings.SAMPLE_COUNT)
+"""Nanoseconds from submitting a job to taking its result."""
+_render_times: _element_timings.RingBuffer = _element_timings.RingBuffer(_element_timings.SAMPLE_COUNT)
+"""Nanoseconds spent in the worker per job."""
+
+def _init_worker() -> None:
+    _os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
+    _os.environ["SDL_VIDEODRIVER"] = "dummy"
+    _pygame.init()
+    _pygame.display.set_mode((1, 1), 0, 32) # Required for Surface.convert_alpha()
+
+def _encode(value: _Any) -> _Any:
+    if isinstance(value, _pygame.Surface):
+        format: str = "RGBA" if value.get_flags() & _pygame.SRCALPHA else "RGB"
+        return _SurfaceData(_pygame.image.tobytes(value, format), value.get_size(), format)
+    if isinstance(value, tuple) and hasattr(value, "_fields"): # NamedTuple
+        return type(value)._make(_encode(field) for field in value)
+    return value
+
+def _decode(value: _Any) -> _Any:
+    if isinstance(value, _SurfaceData):
+        surf: _pygame.Surface = _pygame.image.frombytes(value.pixels, value.size, value.format)
+        return surf.convert_alpha() if value.format == "RGBA" else surf.convert()
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return type(value)._make(_decode(field) for field in value)
+    return value
+
+def _run(function: _Callable[..., _Any], args: tuple[_Any, ...]) -> tuple[_Any, int]:
+    start: int = _perf_counter_ns()
+    result: _Any = _encode(function(*args))
+    return (result, _perf_counter_ns() - start)
+
+def _get_executor() -> _ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn so that the worker does not inherit the render thread's pygame state
+        _executor = _ProcessPoolExecutor(_MAX_WORKERS, mp_context=_multiprocessing.get_context("spawn"), initializer=_init_worker)
+    return _executor
+
+def poll(key: _Hashable, function: _Callable[..., _Any], *args: _Any) -> _Any:
+    """
+    Render `function(*args)` in a worker process. Call repeatedly from the render thread with the same `key`.
+
+    Returns `PENDING` until the result is available. The result is returned once after which the job is forgotten.
+    `function` and `args` must be picklable. Surfaces in the result (directly or as fields of a NamedTuple) are transferred as pixel buffers.
+    Returns `None` if the job failed.
+    """
+    global _executor
+
+    with _jobs_lock:
+        job: _Job | None = _jobs.get(key)
+        if job is None:
+            try:
+                future: _Future = _get_executor().submit(_run, function, args)
+            except _BrokenProcessPool as e:
+                _logging.dump_exception(e, note="embedWorker")
+                _executor = None # Recreated on next poll
+                return None
+            future.add_done_callback(lambda _: _frame_scheduler.request_wakeup())
+            _jobs[key] = _Job(future, _perf_counter_ns())
+            return PENDING
+
+        if not job.future.done():
+            return PENDING
+
+        _jobs.pop(key, None)
+
+    try:
+        result, render_time = job.future.result()
+    except Exception as e:
+        _logging.dump_exception(e, note="embedWorker")
+        if isinstance(e, _BrokenProcessPool):
+            _executor = None
+        return None
+
+    _latencies.append(_perf_counter_ns() - job.submitted_ns)
+    _render_times.append(render_time)
+    return _decode(result)
+
+def discard(key: _Hashable) -> None:
+    """
+    Forget the job of `key` if it is still pending. The job is cancelled if it has not started yet, otherwise its result is dropped.
+
+    Can be called from any thread.
+    """
+    with _jobs_lock:
+        job: _Job | None = _jobs.pop(key, None)
+    if job is not None:
+        job.future.cancel()
+
+def get_stats() -> tuple[int, _element_timings.TimingStats, _element_timings.TimingStats]:
+    """Queue depth, latency and worker render time."""
+    return (len(_jobs), _element_timings.TimingStats(sorted(_latencies.values())), _element_timings.TimingStats(sorted(_render_times.values())))
+
+def quit() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    with _jobs_lock:
+        _jobs.clear()
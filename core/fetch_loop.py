@@ -0,0 +1,158 @@
+import asyncio as _asyncio
+import functools as _functools
+import queue as _queue
+import threading as _threading
+from concurrent.futures import Future as _Future
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from typing import Any as _Any
+from typing import Callable as _Callable
+from typing import TypeVar as _TypeVar
+from core import logging as _logging
+from core import frame_scheduler as _frame_scheduler
+
+_T = _TypeVar("_T")
+
+MAX_CONCURRENT_FETCHES: int = 4
+"""Blocking requests that can run at the same time. Further fetches wait in the event loop without holding a thread."""
+
+_loop: _asyncio.AbstractEventLoop | None = None
+_thread: _threading.Thread | None = None
+_executor: _ThreadPoolExecutor | None = None
+
+_results: "_queue.SimpleQueue[tuple[_Callable[[_Any], _Any], _Any]]" = _queue.SimpleQueue()
+"""Finished fetches waiting to be handed to the render thread."""
+
+_in_flight: int = 0
+_completed: int = 0
+_failed: int = 0
+_stats_lock: _threading.Lock = _threading.Lock()
+
+def init() -> None:
+    """Start the event loop thread. Fetches can be submitted from any thread afterwards."""
+    global _loop, _thread, _executor
+    if _loop is not None:
+        raise RuntimeError("Fetch loop has been initialized already.")
+
+    _executor = _ThreadPoolExecutor(MAX_CONCURRENT_FETCHES, thread_name_prefix="FetchWorker")
+    _loop = _asyncio.new_event_loop()
+    _thread = _threading.Thread(target=_run_loop, args=(_loop,), name="FetchLoop", daemon=True)
+    _thread.start()
+
+def _run_loop(loop: _asyncio.AbstractEventLoop) -> None:
+    _asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+    # Stopped by quit, cancel everything that is still waiting
+    tasks = _asyncio.all_tasks(loop)
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(_asyncio.gather(*tasks, return_exceptions=True))
+    loop.close()
+
+def _get_loop() -> _asyncio.AbstractEventLoop:
+    if _loop is None:
+        raise RuntimeError("Fetch loop has not been initialized.")
+    return _loop
+
+def _update_stats(in_flight: int, completed: int = 0, failed: int = 0) -> None:
+    global _in_flight, _completed, _failed
+    with _stats_lock:
+        _in_flight += in_flight
+        _completed += completed
+        _failed += failed
+
+async def _fetch(function: _Callable[..., _T], args: tuple[_Any, ...], name: str) -> _T:
+    """Run the blocking `function` on the bounded executor. Exceptions are logged and raised."""
+    _update_stats(1)
+    try:
+        result: _T = await _asyncio.get_running_loop().run_in_executor(_executor, _functools.partial(function, *args))
+    except _asyncio.CancelledError:
+        _update_stats(-1)
+        raise
+    except Exception as e:
+        _update_stats(-1, failed=1)
+        _logging.dump_exception(e, note=name)
+        raise
+    _update_stats(-1, completed=1)
+    return result
+
+def _deliver(on_result: _Callable[[_T], _Any] | None, result: _T) -> None:
+    if on_result is None:
+        return
+    _results.put((on_result, result))
+    _frame_scheduler.request_wakeup()
+
+async def _fetch_once(function: _Callable[..., _T], args: tuple[_Any, ...], on_result: _Callable[[_T], _Any] | None, name: str) -> _T:
+    result: _T = await _fetch(function, args, name)
+    _deliver(on_result, result)
+    return result
+
+async def _fetch_repeating(interval: float, initial_delay: float, function: _Callable[..., _T], args: tuple[_Any, ...], on_result: _Callable[[_T], _Any] | None, name: str) -> None:
+    await _asyncio.sleep(initial_delay)
+    while True:
+        try:
+            result: _T = await _fetch(function, args, name)
+        except Exception:
+            pass # Logged by _fetch, try again on next interval
+        else:
+            _deliver(on_result, result)
+        await _asyncio.sleep(interval)
+
+def submit(name: str, function: _Callable[..., _T], *args: _Any, on_result: _Callable[[_T], _Any] | None = None) -> "_Future[_T]":
+    """
+    Fetch `function(*args)` in the background. Can be called from any thread.
+
+    `on_result` is called on the render thread by `process_results` once the fetch has finished.
+    Any board might be active when it is called, so it must only modify the objects it is bound to and not rely on `config.current`, `render_info.active` or the renderer state.
+    The returned future can be waited on directly, for example when the data is required before the first frame.
+    """
+    return _asyncio.run_coroutine_threadsafe(_fetch_once(function, args, on_result, name), _get_loop())
+
+def submit_repeating(name: str, interval: float, function: _Callable[..., _T], *args: _Any, on_result: _Callable[[_T], _Any] | None = None, initial_delay: float = 0.0) -> "_Future[None]":
+    """
+    Fetch `function(*args)` every `interval` seconds until the returned future is cancelled. Failed fetches are retried on the next interval.
+
+    `on_result` has the same restrictions as in `submit`.
+    """
+    return _asyncio.run_coroutine_threadsafe(_fetch_repeating(interval, initial_delay, function, args, on_result, name), _get_loop())
+
+def process_results() -> int:
+    """
+    Call `on_result` of all finished fetches. Must be called from the render thread. Returns the amount of results processed.
+
+    The callbacks are not bound to a board, the active board is left as is.
+    """
+    processed: int = 0
+    while True:
+        try:
+            on_result, result = _results.get_nowait()
+        except _queue.Empty:
+            break
+
+        try:
+            on_result(result)
+        except Exception as e:
+            _logging.dump_exception(e, note="fetchResult")
+        processed += 1
+    return processed
+
+def get_stats() -> tuple[int, int, int]:
+    """In-flight, completed and failed fetch counts."""
+    with _stats_lock:
+        return (_in_flight, _completed, _failed)
+
+def quit() -> None:
+    """Cancel all fetches and stop the loop. Requests that are already running finish in the background."""
+    global _loop, _thread, _executor
+    if _loop is None:
+        return
+
+    _loop.call_soon_threadsafe(_loop.stop)
+    if _thread is not None:
+        _thread.join(timeout=5.0)
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+
+    _loop = None
+    _thread = None
+    _executor = None
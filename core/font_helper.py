@@ -1,8 +1,136 @@
 from nalpy import math
 from core import logging, testing
 from typing import Iterable, NamedTuple
+from collections import OrderedDict
 import pygame
 
+_MAX_SIZES_PER_PATH: int = 8
+
+_loaded_fonts: dict[str, OrderedDict[int, pygame.font.Font]] = {}
+"""Fonts keyed by path and size. Shared by all `SizedFont` instances. Each path is an LRU bounded to `_MAX_SIZES_PER_PATH` sizes."""
+_load_counts: dict[str, int] = {}
+
+def _get_font(path: str, size: int, purpose: str | None) -> pygame.font.Font:
+    sizes: OrderedDict[int, pygame.font.Font] | None = _loaded_fonts.get(path)
+    if sizes is None:
+        sizes = OrderedDict()
+        _loaded_fonts[path] = sizes
+
+    font: pygame.font.Font | None = sizes.get(size)
+    if font is not None:
+        sizes.move_to_end(size)
+        return font
+
+    if purpose is not None:
+        logging.debug(f"Loading new font for {purpose}...", stack_info=False)
+
+    font = pygame.font.Font(path, size)
+    _load_counts[path] = _load_counts.get(path, 0) + 1
+
+    sizes[size] = font
+    if len(sizes) > _MAX_SIZES_PER_PATH:
+        sizes.popitem(last=False)
+
+    return font
+
+def get_load_counts() -> dict[str, int]:
+    """How many times each font path has been loaded from disk."""
+    return _load_counts.copy()
+
+_MAX_TEXT_CACHE_BYTES: int = 4 * 1_048_576
+
+_TextKey = tuple[pygame.font.Font, str, bool, tuple[int, ...], tuple[int, ...] | None]
+_text_cache: OrderedDict[_TextKey, pygame.Surface] = OrderedDict()
+_text_cache_bytes: int = 0
+_text_cache_hits: int = 0
+_text_cache_misses: int = 0
+
+def _get_surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+def render_text(font: pygame.font.Font, text: str, antialias: bool, color: tuple[int, int, int], background: tuple[int, int, int] | None = None) -> pygame.Surface:
+    """
+    Cached `font.render`. Least recently used renders are evicted once the cache grows over `_MAX_TEXT_CACHE_BYTES`.
+
+    The returned surface is shared. Copy it before drawing onto it.
+    """
+    global _text_cache_bytes, _text_cache_hits, _text_cache_misses
+
+    key: _TextKey = (font, text, antialias, tuple(color), tuple(background) if background is not None else None)
+    render: pygame.Surface | None = _text_cache.get(key)
+    if render is not None:
+        _text_cache.move_to_end(key)
+        _text_cache_hits += 1
+        return render
+
+    _text_cache_misses += 1
+    render = font.render(text, antialias, color, background)
+
+    _text_cache[key] = render
+    _text_cache_bytes += _get_surface_bytes(render)
+    while _text_cache_bytes > _MAX_TEXT_CACHE_BYTES and len(_text_cache) > 1:
+        _, evicted = _text_cache.popitem(last=False)
+        _text_cache_bytes -= _get_surface_bytes(evicted)
+
+    return render
+
+def get_text_cache_stats() -> tuple[int, int, int]:
+    """Hit count, miss count and the size of the cached renders in bytes."""
+    return _text_cache_hits, _text_cache_misses, _text_cache_bytes
+
+CLOCK_CHARACTERS: str = "0123456789:"
+
+_MAX_GLYPH_ATLASES: int = 8
+
+class GlyphAtlas:
+    def __init__(self, font: pygame.font.Font, color: tuple[int, int, int], characters: str = CLOCK_CHARACTERS) -> None:
+        """
+        Antialiased renders of `characters` packed into a single surface.
+        Text consisting only of these characters can be drawn by blitting atlas cells instead of rendering it.
+        """
+        renders: list[tuple[str, pygame.Surface]] = [(char, font.render(char, True, color)) for char in characters]
+
+        width: int = sum(render.get_width() for _, render in renders)
+        self._height: int = max(render.get_height() for _, render in renders)
+        self._surface: pygame.Surface = pygame.Surface((max(width, 1), self._height), pygame.SRCALPHA)
+        self._cells: dict[str, pygame.Rect] = {}
+
+        x: int = 0
+        for char, render in renders:
+            # Atlas is fully transparent and cells don't overlap so max copies the glyph's color and alpha unchanged
+            self._surface.blit(render, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self._cells[char] = pygame.Rect(x, 0, render.get_width(), render.get_height())
+            x += render.get_width()
+
+    def can_render(self, text: str) -> bool:
+        return all(char in self._cells for char in text)
+
+    def size(self, text: str) -> tuple[int, int]:
+        return (sum(self._cells[char].width for char in text), self._height)
+
+    def blit(self, target: pygame.Surface, text: str, dest: tuple[int, int]) -> None:
+        """Draw `text` onto `target` with its top-left corner at `dest`. Check `can_render` first."""
+        x, y = dest
+        blits: list[tuple[pygame.Surface, tuple[int, int], pygame.Rect]] = []
+        for char in text:
+            cell: pygame.Rect = self._cells[char]
+            blits.append((self._surface, (x, y), cell))
+            x += cell.width
+        target.blits(blits, doreturn=False)
+
+_glyph_atlases: dict[tuple[pygame.font.Font, tuple[int, ...]], GlyphAtlas] = {}
+
+def get_glyph_atlas(font: pygame.font.Font, color: tuple[int, int, int]) -> GlyphAtlas:
+    """Clock character atlas for `font` and `color`. Built once per font, i.e. once per font size."""
+    key: tuple[pygame.font.Font, tuple[int, ...]] = (font, tuple(color))
+    atlas: GlyphAtlas | None = _glyph_atlases.get(key)
+    if atlas is None:
+        if len(_glyph_atlases) >= _MAX_GLYPH_ATLASES: # Fonts only change when the display is resized
+            _glyph_atlases.clear()
+        atlas = GlyphAtlas(font, color)
+        _glyph_atlases[key] = atlas
+    return atlas
+
 class SizedFont:
     def __init__(self, path: str, purpose: str | None = None) -> None:
         self._path: str = path
@@ -13,34 +141,68 @@ class SizedFont:
 
     def get_size(self, size: int) -> pygame.font.Font:
         if self._font is None or size != self._loaded_size:
-            if self._purpose is not None:
-                logging.debug(f"Loading new font for {self._purpose}...", stack_info=False)
-
             self._loaded_size = size
-            self._font = pygame.font.Font(self._path, size)
+            self._font = _get_font(self._path, size, self._purpose)
 
         return self._font
 
 
+_MAX_CACHED_WORD_WIDTHS: int = 4096
+_MAX_CACHED_FONTS_FOR_WORDS: int = 8
+_MAX_CACHED_PAGINATIONS: int = 16
+
+_word_widths: dict[pygame.font.Font, dict[str, int]] = {}
+_paginations: OrderedDict[tuple[str, pygame.font.Font, tuple[int, int]], tuple["Page", ...]] = OrderedDict()
+
+def _get_word_widths(font: pygame.font.Font) -> dict[str, int]:
+    widths: dict[str, int] | None = _word_widths.get(font)
+    if widths is None:
+        if len(_word_widths) >= _MAX_CACHED_FONTS_FOR_WORDS: # Fonts only change when the display is resized
+            _word_widths.clear()
+        widths = {}
+        _word_widths[font] = widths
+    elif len(widths) >= _MAX_CACHED_WORD_WIDTHS:
+        widths.clear()
+    return widths
+
 def wrap_text(font: pygame.font.Font, text: str, max_width: int) -> Iterable[str]:
     """
     Wrap text to fit within a maximum width.
+
+    Each distinct word is measured once per font and line widths are accumulated from word widths.
     """
 
     WORD_BOUNDARY = " "
 
-    line: str | None = None
+    widths: dict[str, int] = _get_word_widths(font)
+    boundary_width: int | None = widths.get(WORD_BOUNDARY)
+    if boundary_width is None:
+        boundary_width = font.size(WORD_BOUNDARY)[0]
+        widths[WORD_BOUNDARY] = boundary_width
+
+    line: list[str] | None = None
+    line_width: int = 0
     for word in text.split(WORD_BOUNDARY):
-        if line is not None and font.size(line + WORD_BOUNDARY + word)[0] > max_width:
-            yield line
-            line = word
+        word_width: int | None = widths.get(word)
+        if word_width is None:
+            word_width = font.size(word)[0]
+            widths[word] = word_width
+
+        if line is not None and line_width + boundary_width + word_width > max_width:
+            yield WORD_BOUNDARY.join(line)
+            line = [word]
+            line_width = word_width
         elif line is None:
-            line = word
+            line = [word]
+            line_width = word_width
         else:
-            line += WORD_BOUNDARY + word
+            line.append(word)
+            line_width += boundary_width + word_width
 
-    if line is not None and len(line) > 0:
-        yield line
+    if line is not None:
+        joined: str = WORD_BOUNDARY.join(line)
+        if len(joined) > 0:
+            yield joined
 
 
 class Page(NamedTuple):
@@ -48,26 +210,40 @@ class Page(NamedTuple):
     size: tuple[int, int]
     lines: tuple[str, ...]
 
-def pagination(font: pygame.font.Font, text: str, page_size: tuple[int, int]) -> Iterable[Page]:
+def pagination(font: pygame.font.Font, text: str, page_size: tuple[int, int]) -> tuple[Page, ...]:
     """
     Split text into pages.
+
+    Results are memoized per text, font and page size.
     """
 
+    key: tuple[str, pygame.font.Font, tuple[int, int]] = (text, font, (page_size[0], page_size[1]))
+    pages: tuple[Page, ...] | None = _paginations.get(key)
+    if pages is not None:
+        _paginations.move_to_end(key)
+        return pages
+
     lines: list[str] = list(wrap_text(font, text, page_size[0]))
 
     lines_per_page: int = math.floor(page_size[1] / font.get_linesize())
 
-    for i in range(0, len(lines), lines_per_page):
-        page_index = int(i / lines_per_page)
-        page_lines = tuple(lines[i:i + lines_per_page])
-        yield Page(page_index, page_size, page_lines)
+    pages = tuple(
+        Page(int(i / lines_per_page), page_size, tuple(lines[i:i + lines_per_page]))
+        for i in range(0, len(lines), lines_per_page)
+    )
+
+    _paginations[key] = pages
+    if len(_paginations) > _MAX_CACHED_PAGINATIONS:
+        _paginations.popitem(last=False)
+
+    return pages
 
 def render_page(font: pygame.font.Font, page: Page, antialias: bool, color: tuple[int, int, int], background: tuple[int, int, int] | None = None) -> pygame.Surface:
     def render_generator() -> Iterable[tuple[pygame.Surface, tuple[int, int]]]:
         linesize: int = font.get_linesize()
 
         for i, line in enumerate(page.lines):
-            render = font.render(line, antialias, color, background)
+            render = render_text(font, line, antialias, color, background)
             y: int = i * linesize
             yield render, (0, y)
 
@@ -0,0 +1,72 @@
+import datetime as _datetime
+import time as _time
+import pygame as _pygame
+
+WAKEUP_EVENT: int = _pygame.event.custom_type()
+
+_STATS_WINDOW_NS: int = 10_000_000_000 # 10 seconds
+
+_wakeups: dict[str, int] = {
+    "deadline": 0,
+    "event": 0,
+    "timeout": 0
+}
+
+_window_start_ns: int = _time.perf_counter_ns()
+_window_idle_ns: int = 0
+_idle_fraction: float | None = None
+
+def request_wakeup() -> None:
+    """Wake the render loop before its next deadline. Can be called from any thread."""
+    if not _pygame.display.get_init():
+        return
+    _pygame.event.post(_pygame.event.Event(WAKEUP_EVENT))
+
+def wait(deadline: _datetime.datetime | None, max_idle_time: float) -> list[_pygame.event.Event]:
+    """
+    Sleep until `deadline` or until an event arrives. Returns all pending events.
+
+    Sleeps for `max_idle_time` seconds at most so that data fetched by other threads is picked up eventually.
+    """
+    global _window_start_ns, _window_idle_ns, _idle_fraction
+
+    timeout: float = max_idle_time
+    deadline_reason: str = "timeout"
+    if deadline is not None:
+        until_deadline: float = (deadline - _datetime.datetime.now()).total_seconds()
+        if until_deadline < timeout:
+            timeout = until_deadline
+            deadline_reason = "deadline"
+
+    timeout_ms: int = int(timeout * 1000)
+    if timeout_ms <= 0:
+        return _pygame.event.get()
+
+    wait_start: int = _time.perf_counter_ns()
+    first_event: _pygame.event.Event = _pygame.event.wait(timeout_ms)
+    wait_end: int = _time.perf_counter_ns()
+
+    events: list[_pygame.event.Event]
+    if first_event.type == _pygame.NOEVENT:
+        _wakeups[deadline_reason] += 1
+        events = _pygame.event.get()
+    else:
+        _wakeups["event"] += 1
+        events = [first_event, *_pygame.event.get()]
+
+    _window_idle_ns += wait_end - wait_start
+    window_length: int = wait_end - _window_start_ns
+    if window_length >= _STATS_WINDOW_NS:
+        _idle_fraction = _window_idle_ns / window_length
+        _window_start_ns = wait_end
+        _window_idle_ns = 0
+
+    return events
+
+def get_idle_fraction() -> float | None:
+    """Portion of time spent sleeping during the last full 10 second window. `None` if no window has finished yet."""
+    return _idle_fraction
+
+def get_wakeups() -> dict[str, int]:
+    """Wakeup counts by reason."""
+    return _wakeups.copy()
@@ -0,0 +1,63 @@
+import sys
+from abc import ABC, abstractmethod
+from typing import BinaryIO
+import pygame
+
+STDOUT_PATH: str = "-"
+
+class FrameSink(ABC):
+    @abstractmethod
+    def write(self, surface: pygame.Surface, frame_index: int) -> None:
+        """Write a finished frame. Called after every frame that changed the display surface."""
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        pass
+
+class PngFrameSink(FrameSink):
+    def __init__(self, path: str) -> None:
+        """`path` can contain a `{frame}` placeholder to number the images. Otherwise the same file is overwritten each frame."""
+        self._path: str = path
+
+    def write(self, surface: pygame.Surface, frame_index: int) -> None:
+        pygame.image.save(surface, self._path.format(frame=frame_index))
+
+class RawFrameSink(FrameSink):
+    def __init__(self, path: str) -> None:
+        """
+        Appends frames as raw RGB bytes. Named pipes are opened like normal files.
+
+        Use `-` to write into stdout. Console logging must then be written elsewhere, see `writes_into_stdout`.
+        """
+        self._owns_stream: bool = path != STDOUT_PATH
+        self._stream: BinaryIO
+        if self._owns_stream:
+            self._stream = open(path, "wb")
+        else:
+            assert sys.__stdout__ is not None
+            self._stream = sys.__stdout__.buffer
+
+    def write(self, surface: pygame.Surface, frame_index: int) -> None:
+        self._stream.write(pygame.image.tobytes(surface, "RGB"))
+        self._stream.flush()
+
+    def close(self) -> None:
+        if self._owns_stream:
+            self._stream.close()
+
+def create_frame_sink(format: str, path: str | None) -> FrameSink:
+    if path is None:
+        raise ValueError("frame_output_path must be set when frame_output_format is set.")
+
+    match format:
+        case "png":
+            if path == STDOUT_PATH:
+                raise ValueError("PNG frames cannot be written into stdout. Use the raw format instead.")
+            return PngFrameSink(path)
+        case "raw":
+            return RawFrameSink(path)
+        case _:
+            raise ValueError(f"Unknown frame output format: '{format}'")
+
+def writes_into_stdout(format: str | None, path: str | None) -> bool:
+    return format is not None and path == STDOUT_PATH
@@ -0,0 +1,108 @@
+import threading as _threading
+import collections as _collections
+from time import perf_counter_ns as _perf_counter_ns
+from urllib.parse import urlsplit as _urlsplit
+import requests as _requests
+from requests.adapters import HTTPAdapter as _HTTPAdapter
+
+DEFAULT_TIMEOUT: tuple[float, float] = (5.0, 30.0)
+"""Connect and read timeouts in seconds."""
+
+_LATENCY_SAMPLE_COUNT: int = 64
+
+class _HostStats:
+    def __init__(self) -> None:
+        self.requests: int = 0
+        self.failures: int = 0
+        self.bytes_received: int = 0
+        self.latencies: _collections.deque[int] = _collections.deque(maxlen=_LATENCY_SAMPLE_COUNT)
+
+_lock: _threading.Lock = _threading.Lock()
+_stats: dict[str, _HostStats] = {}
+
+_local: _threading.local = _threading.local()
+"""
+`requests.Session` is not thread-safe so every thread has its own sessions keyed by scheme and host.
+Each session keeps a single connection to its host alive. Requests run on a small fixed set of threads (fetch loop workers and timers).
+"""
+_all_sessions: list[_requests.Session] = []
+"""Sessions of every thread so that `close` can close them."""
+_generation: int = 0
+"""Incremented by `close` so that threads drop their closed sessions."""
+
+def _get_host(url: str) -> str:
+    parts = _urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+def _get_session(host: str) -> _requests.Session:
+    sessions: dict[str, _requests.Session] | None = getattr(_local, "sessions", None)
+    if sessions is None or getattr(_local, "generation", None) != _generation:
+        sessions = {}
+        _local.sessions = sessions
+        _local.generation = _generation
+
+    session: _requests.Session | None = sessions.get(host)
+    if session is None:
+        session = _requests.Session()
+        adapter = _HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        session.mount(host, adapter)
+        sessions[host] = session
+        with _lock:
+            _all_sessions.append(session)
+            _stats.setdefault(host, _HostStats())
+    return session
+
+def request(method: str, url: str, *, data: str | bytes | None = None, headers: dict[str, str] | None = None, timeout: tuple[float, float] = DEFAULT_TIMEOUT) -> _requests.Response:
+    """
+    Send a request using the calling thread's kept-alive connection to the url's host. Can be called from any thread.
+
+    Raises `requests.RequestException` on connection errors and timeouts. HTTP error statuses are returned as is.
+    """
+    host: str = _get_host(url)
+    session: _requests.Session = _get_session(host)
+
+    start: int = _perf_counter_ns()
+    try:
+        response: _requests.Response = session.request(method, url, data=data, headers=headers, timeout=timeout)
+    except _requests.RequestException:
+        with _lock:
+            failed_stats: _HostStats = _stats[host]
+            failed_stats.requests += 1
+            failed_stats.failures += 1
+        raise
+    elapsed: int = _perf_counter_ns() - start
+
+    with _lock:
+        stats: _HostStats = _stats[host]
+        stats.requests += 1
+        if not response.ok:
+            stats.failures += 1
+        stats.bytes_received += len(response.content)
+        stats.latencies.append(elapsed)
+
+    return response
+
+def get(url: str, *, headers: dict[str, str] | None = None, timeout: tuple[float, float] = DEFAULT_TIMEOUT) -> _requests.Response:
+    return request("GET", url, headers=headers, timeout=timeout)
+
+def post(url: str, data: str | bytes, *, headers: dict[str, str] | None = None, timeout: tuple[float, float] = DEFAULT_TIMEOUT) -> _requests.Response:
+    return request("POST", url, data=data, headers=headers, timeout=timeout)
+
+def _median_ms(values: list[int]) -> float:
+    if len(values) < 1:
+        return 0.0
+    return sorted(values)[len(values) // 2] / 1_000_000
+
+def get_stats() -> dict[str, tuple[int, int, int, float]]:
+    """Request count, failure count, bytes received and median latency in milliseconds keyed by host."""
+    with _lock:
+        return {host: (stats.requests, stats.failures, stats.bytes_received, _median_ms(list(stats.latencies))) for host, stats in _stats.items()}
+
+def close() -> None:
+    """Close the kept-alive connections of every thread. Sessions are recreated on the next request. Should be called after the requesting threads have stopped."""
+    global _generation
+    with _lock:
+        for session in _all_sessions:
+            session.close()
+        _all_sessions.clear()
+        _generation += 1
@@ -1,12 +1,15 @@
 # More secure than Log4j!
 
+import contextlib as _contextlib
 import inspect as _inspect
 import logging as _logger
 import os as _os
 import platform as _platform
+import sys as _sys
 import threading
 import traceback as _traceback
 import types
+from typing import TextIO as _TextIO
 import psutil as _psutil
 import pygame as _pygame
 
@@ -61,7 +64,15 @@ def _validate_logfile_name(filename: str) -> _datetime | None:
 def _validate_crashfile_name(filename: str) -> _datetime | None:
     return _validate_logfilelike_name(filename, _crashfile_extension, _crashfile_prefix)
 
-def init():
+_console_stream: _TextIO | None = None
+"""Stream of the console output. `None` writes into stdout."""
+_console_lock: threading.Lock = threading.Lock()
+
+def init(console_stream: _TextIO | None = None):
+    """Console output is written into `console_stream` or stdout if `None`."""
+    global _console_stream
+    _console_stream = console_stream
+
     # Create log directory if it doesn't exist
     _os.makedirs(LOGGING_DIRECTORY, exist_ok=True)
 
@@ -179,16 +190,19 @@ def _log(message: str | Exception, console_visible: bool, stack_info: bool, log_
             console_message.append("    Read log file for more details.")
 
         color, colorize_text = _loglevel_colors[log_level]
-        _console_utils.set_background_color(color)
         prefix = f"[ {_logger.getLevelName(log_level)} ]"
-        print(prefix, end="")
-        _console_utils.reset_attributes()
-        if colorize_text:
-            _console_utils.set_foreground_color(color)
-        print(" ", end="")
-        print(*console_message, sep="\n" + " " * (len(prefix) + 1), end="")
-        _console_utils.reset_attributes()
-        print()
+        # console_utils prints its escape codes into sys.stdout so it is swapped for the duration of the message.
+        # The lock keeps the swap (and the lines) from interleaving between threads.
+        with _console_lock, _contextlib.redirect_stdout(_console_stream if _console_stream is not None else _sys.stdout):
+            _console_utils.set_background_color(color)
+            print(prefix, end="")
+            _console_utils.reset_attributes()
+            if colorize_text:
+                _console_utils.set_foreground_color(color)
+            print(" ", end="")
+            print(*console_message, sep="\n" + " " * (len(prefix) + 1), end="")
+            _console_utils.reset_attributes()
+            print()
 
 def debug(message: str | Exception, console_visible: bool = True, stack_info: bool = True) -> None:
     _log(message, console_visible, stack_info, _logger.DEBUG)
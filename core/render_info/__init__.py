@@ -1,30 +1,49 @@
 from core import config as _config
-from core import logging as _logging
 import digitransit.routing as _routing
-import threading as _threading
-import core.render_info.embeds as _embed_render_info
 
 from core.render_info.embeds import CurrentEmbedData as CurrentEmbedData
+from core.render_info.embeds import EmbedCycle as EmbedCycle
 
 
-def get_stop_gtfsId() -> str:
-    return f"tampere:{_config.current.stopcode:04d}"
+class BoardInfo:
+    def __init__(self, board_config: _config.Config) -> None:
+        """
+        Data shown on a single stop board.
+
+        Background threads must use the board they were started for instead of the active board.
+        """
+        self.config: _config.Config = board_config
+        self._stopinfo: _routing.Stop | None = None
+        self.embed_cycle: EmbedCycle = EmbedCycle(self)
+
+    @property
+    def stopinfo(self) -> _routing.Stop:
+        if self._stopinfo is None:
+            raise RuntimeError("Stop info has not been loaded.")
+        return self._stopinfo
+
+    @stopinfo.setter
+    def stopinfo(self, value: _routing.Stop) -> None:
+        self._stopinfo = value
 
-stopinfo: _routing.Stop
+    def get_stop_gtfsId(self) -> str:
+        return f"tampere:{self.config.stopcode:04d}"
 
-def update_stopinfo() -> None:
-    global stopinfo
-    _logging.info("Fetching stop info...", stack_info=False)
-    try:
-        stopinfo = _routing.get_stop_info(_config.current.endpoint, _config.current.api_key.value, get_stop_gtfsId(), _config.current.departure_count, _config.current.omit_non_pickups, _config.current.omit_canceled)
-    except Exception as e:
-        _logging.dump_exception(e, _threading.current_thread(), "requestFail")
+    def get_stop_query(self) -> _routing.StopQuery:
+        return _routing.StopQuery(self.get_stop_gtfsId(), self.config.departure_count, self.config.omit_non_pickups, self.config.omit_canceled)
 
-current_embed_data: CurrentEmbedData | None = None
-current_embed_data_lock: _threading.Lock = _threading.Lock()
+active: BoardInfo
+"""Board that is currently being rendered. Swapped by `core.boards` when rendering multiple boards."""
+
+def init() -> None:
+    global active
+    active = BoardInfo(_config.current)
+
+def get_stop_gtfsId() -> str:
+    return active.get_stop_gtfsId()
 
 def start_embed_cycling():
-    _embed_render_info.start_embed_cycling()
+    active.embed_cycle.start()
 
 def stop_embed_cycling():
-    _embed_render_info.stop_embed_cycling()
+    active.embed_cycle.stop()
@@ -1,94 +1,106 @@
+from __future__ import annotations
 import threading
 import time
-from typing import NamedTuple
-from core import logging, config, render_info, threadex
+from typing import TYPE_CHECKING, NamedTuple
+from core import logging, threadex, frame_scheduler
 import embeds
 
+if TYPE_CHECKING:
+    from core.render_info import BoardInfo
+
 
 class CurrentEmbedData(NamedTuple):
     embed: embeds.Embed
     requested_duration: float
     enabled_posix_timestamp: float
 
-embed_index: int = -1
-cycle_embed_timer: threading.Timer | None = None
-cycle_running: bool = False
+class EmbedCycle:
+    def __init__(self, board: BoardInfo) -> None:
+        """Cycles through the embeds enabled in the board's config. Each board has its own embed instances."""
+        self.board: BoardInfo = board
+
+        self.embed_index: int = -1
+        self.cycle_embed_timer: threading.Timer | None = None
+        self.cycle_running: bool = False
+
+        self.enabled_embeds: tuple[embeds.Embed, ...] | None = None
 
-enabled_embeds: tuple[embeds.Embed, ...] | None = None
+        self.current_embed_data: CurrentEmbedData | None = None
+        self.current_embed_data_lock: threading.Lock = threading.Lock()
 
-def _load_embeds() -> tuple[embeds.Embed, ...]:
-    logging.debug(f"Loading embeds from config...", stack_info=False)
-    all_embeds: list[embeds.Embed] = []
+    def _load_embeds(self) -> tuple[embeds.Embed, ...]:
+        logging.debug(f"Loading embeds from config...", stack_info=False)
+        all_embeds: list[embeds.Embed] = []
 
-    for embed_launch_str in config.current.enabled_embeds:
-        embed_launch: list[str] = embed_launch_str.split(" ")
-        embed_name = embed_launch[0]
-        embed_args = embed_launch[1:]
+        for embed_launch_str in self.board.config.enabled_embeds:
+            embed_launch: list[str] = embed_launch_str.split(" ")
+            embed_name = embed_launch[0]
+            embed_args = embed_launch[1:]
 
-        prettyprint_args = ' '.join(embed_args)
-        logging.debug(f"Loading new embed '{embed_name}' with arguments '{prettyprint_args}' into cache...", stack_info=False)
+            prettyprint_args = ' '.join(embed_args)
+            logging.debug(f"Loading new embed '{embed_name}' with arguments '{prettyprint_args}' into cache...", stack_info=False)
 
-        valid_embeds: list[type[embeds.Embed]] = list(filter(lambda e: e.name() == embed_name, embeds.ALL_EMBEDS))
-        assert len(valid_embeds) > 0, f"No embed named '{embed_name}' found!"
-        assert len(valid_embeds) == 1, f"Multiple embeds named '{embed_name}' found!"
+            valid_embeds: list[type[embeds.Embed]] = list(filter(lambda e: e.name() == embed_name, embeds.ALL_EMBEDS))
+            assert len(valid_embeds) > 0, f"No embed named '{embed_name}' found!"
+            assert len(valid_embeds) == 1, f"Multiple embeds named '{embed_name}' found!"
 
-        all_embeds.append(valid_embeds[0](*embed_args))
+            embed: embeds.Embed = valid_embeds[0](*embed_args)
+            embed.attach(self.board)
+            all_embeds.append(embed)
 
-    logging.debug(f"Embed loading complete.", stack_info=False)
-    return tuple(all_embeds)
+        logging.debug(f"Embed loading complete.", stack_info=False)
+        return tuple(all_embeds)
 
-def _cycle_embed() -> None:
-    global enabled_embeds, embed_index, cycle_embed_timer
-    if enabled_embeds is None:
-        enabled_embeds = _load_embeds()
+    def _cycle_embed(self) -> None:
+        if self.enabled_embeds is None:
+            self.enabled_embeds = self._load_embeds()
 
-    logging.debug("Switching embed...", stack_info=False)
-    if len(enabled_embeds) < 1:
-        logging.info("No embeds enabled! Cancelling embed cycling...", stack_info=False)
-        cycle_embed_timer = None
-        return
+        logging.debug("Switching embed...", stack_info=False)
+        if len(self.enabled_embeds) < 1:
+            logging.info("No embeds enabled! Cancelling embed cycling...", stack_info=False)
+            self.cycle_embed_timer = None
+            return
 
-    new_embed: embeds.Embed | None = None
-    new_embed_find_iterations: int = 0
-    while new_embed is None or new_embed.requested_duration() <= 0.0:
-        embed_count: int = len(config.current.enabled_embeds)
-        if new_embed_find_iterations > embed_count:
-            raise RuntimeError("maximum embed find recursion depth reached.")
+        new_embed: embeds.Embed | None = None
+        new_embed_find_iterations: int = 0
+        while new_embed is None or new_embed.requested_duration() <= 0.0:
+            embed_count: int = len(self.enabled_embeds)
+            if new_embed_find_iterations > embed_count:
+                raise RuntimeError("maximum embed find recursion depth reached.")
 
-        embed_index = (embed_index + 1) % embed_count
-        new_embed = enabled_embeds[embed_index]
-        new_embed_find_iterations += 1
+            self.embed_index = (self.embed_index + 1) % embed_count
+            new_embed = self.enabled_embeds[self.embed_index]
+            new_embed_find_iterations += 1
+
+        with self.current_embed_data_lock:
+            # disable old
+            if self.current_embed_data is not None:
+                try:
+                    self.current_embed_data.embed.on_disable()
+                except Exception as e:
+                    logging.dump_exception(e, self.cycle_embed_timer, "embedDisableFail")
 
-    with render_info.current_embed_data_lock:
-        # disable old
-        if render_info.current_embed_data is not None:
             try:
-                render_info.current_embed_data.embed.on_disable()
+                new_embed.on_enable()
             except Exception as e:
-                logging.dump_exception(e, cycle_embed_timer, "embedDisableFail")
-
-        try:
-            new_embed.on_enable()
-        except Exception as e:
-            logging.dump_exception(e, cycle_embed_timer, "embedEnableFail")
-        render_info.current_embed_data = CurrentEmbedData(new_embed, new_embed.requested_duration(), time.time())
+                logging.dump_exception(e, self.cycle_embed_timer, "embedEnableFail")
+            self.current_embed_data = CurrentEmbedData(new_embed, new_embed.requested_duration(), time.time())
 
-        cycle_embed_timer = threading.Timer(render_info.current_embed_data.requested_duration, _cycle_embed)
-        cycle_embed_timer.daemon = False
-        cycle_embed_timer.name = threadex.thread_names.name_with_identifier("EmbedCycleTimer")
-        cycle_embed_timer.start()
+            self.cycle_embed_timer = threading.Timer(self.current_embed_data.requested_duration, self._cycle_embed)
+            self.cycle_embed_timer.daemon = False
+            self.cycle_embed_timer.name = threadex.thread_names.name_with_identifier("EmbedCycleTimer")
+            self.cycle_embed_timer.start()
 
-def start_embed_cycling() -> None:
-    global cycle_running
-    if cycle_running:
-        raise RuntimeError("Cannot start embed cycling. Embed cycling is already running.")
+        frame_scheduler.request_wakeup()
 
-    cycle_running = True
-    _cycle_embed()
+    def start(self) -> None:
+        if self.cycle_running:
+            raise RuntimeError("Cannot start embed cycling. Embed cycling is already running.")
 
-def stop_embed_cycling() -> None:
-    global cycle_running
+        self.cycle_running = True
+        self._cycle_embed()
 
-    if cycle_embed_timer is not None:
-        cycle_embed_timer.cancel()
-    cycle_running = False
+    def stop(self) -> None:
+        if self.cycle_embed_timer is not None:
+            self.cycle_embed_timer.cancel()
+        self.cycle_running = False
@@ -1,11 +1,19 @@
 import typing as _typing
 import pygame as _pygame
 import random as _random
+import heapq as _heapq
+import itertools as _itertools
 import datetime as _datetime
+from time import perf_counter_ns as _perf_counter_ns
 from core import constants as _constants
 from core import elements as _elements
 from core import debug as _debug
 from core import logging as _logging
+from core import frame_sink as _frame_sink
+from core import surface_pool as _surface_pool
+from core import textures as _textures
+from core.damage_region import DamageRegion as _DamageRegion
+from core.spatial_index import RectGrid as _RectGrid
 from nysse import background_generator as _nysse_background
 from nalpy import math as _math
 
@@ -17,6 +25,48 @@ class _DeferredRender(_typing.NamedTuple):
     element_ref: _elements.ElementRenderer
     debug_color: tuple[int, int, int]
 
+class _RenderJob(_typing.NamedTuple):
+    surface: _pygame.Surface | None
+    rect: _pygame.Rect
+    flags: _elements.RenderFlags
+    element_ref: _elements.ElementRenderer
+    debug_color: tuple[int, int, int]
+
+class _BlitBatch:
+    def __init__(self, target: _pygame.Surface, batched: bool) -> None:
+        """Collects blits and issues them as a single `Surface.blits` call on flush. Blits immediately if not `batched`."""
+        self._target: _pygame.Surface = target
+        self.batched: bool = batched
+        self._blits: list[tuple[_pygame.Surface, tuple[int, int]]] = []
+
+        self.count: int = 0
+        self.elapsed_ns: int = 0
+
+    def blit(self, surface: _pygame.Surface, dest: tuple[int, int]) -> None:
+        self.count += 1
+        if self.batched:
+            self._blits.append((surface, dest))
+        else:
+            blit_start: int = _perf_counter_ns()
+            self._target.blit(surface, dest)
+            self.elapsed_ns += _perf_counter_ns() - blit_start
+
+    def flush(self) -> None:
+        """Must be called before drawing onto the target surface by other means to preserve draw order."""
+        if len(self._blits) < 1:
+            return
+
+        blits_start: int = _perf_counter_ns()
+        self._target.blits(self._blits, doreturn=False)
+        self.elapsed_ns += _perf_counter_ns() - blits_start
+        self._blits.clear()
+
+_blit_cost_samples: dict[bool, _debug.element_timings.RingBuffer] = {
+    True: _debug.element_timings.RingBuffer(_debug.element_timings.SAMPLE_COUNT),
+    False: _debug.element_timings.RingBuffer(_debug.element_timings.SAMPLE_COUNT)
+}
+"""Nanoseconds per blit keyed by whether the blits were batched."""
+
 _display_surf: _pygame.Surface
 _clock: _pygame.time.Clock
 
@@ -33,22 +83,135 @@ def reset_debug_colors() -> None:
     _renderer_debug_colors.clear()
 
 _immediate_renders: list[_elements.ElementRenderer] = []
-_deferred_renders: list[_DeferredRender] = []
+_deferred_renders: list[tuple[_datetime.datetime, int, _DeferredRender]] = []
+"""Heap ordered by render time. Contains superseded entries that are skipped when popped."""
+_deferred_sequence: _itertools.count = _itertools.count()
+_pending_deferred: dict[_elements.ElementRenderer, int] = {}
+"""Sequence number of the only valid deferred render of each element."""
 _rerender_renders: list[_elements.ElementRenderer] = []
 
+_element_index: _RectGrid[_elements.ElementRenderer] = _RectGrid()
+_element_index_size: tuple[int, int] | None = None
+"""Display size the element index was built for. `None` if the index needs to be rebuilt."""
+
 _initialized: bool = False
 
 _background: _pygame.Surface | None = None
 
-def init(size: tuple[int, int], flags: int):
-    global _display_surf, _clock, _initialized
-
-    _pygame.display.set_caption(_constants.APP_DISPLAYNAME)
-    _pygame.display.set_icon(_pygame.image.load("resources/textures/icon.png"))
+_offscreen: bool = False
+_sink: _frame_sink.FrameSink | None = None
+_frame_index: int = 0
+
+class RendererState:
+    def __init__(self) -> None:
+        """
+        Renderer state of a single board.
+
+        The renderer keeps the state of the active board in module globals.
+        Boards are switched by swapping the globals with `get_state` and `set_state`.
+        Caches that do not depend on the board (fonts, textures, surface pool, etc.) are shared.
+        """
+        self.display_surf: _pygame.Surface | None = None
+        self.clock: _pygame.time.Clock | None = None
+
+        self.renderers: tuple[_elements.ElementRenderer, ...] = tuple()
+        self.immediate_renders: list[_elements.ElementRenderer] = []
+        self.deferred_renders: list[tuple[_datetime.datetime, int, _DeferredRender]] = []
+        self.deferred_sequence: _itertools.count = _itertools.count()
+        self.pending_deferred: dict[_elements.ElementRenderer, int] = {}
+        self.rerender_renders: list[_elements.ElementRenderer] = []
+
+        self.element_index: _RectGrid[_elements.ElementRenderer] = _RectGrid()
+        self.element_index_size: tuple[int, int] | None = None
+
+        self.initialized: bool = False
+        self.background: _pygame.Surface | None = None
+
+        self.offscreen: bool = False
+        self.sink: _frame_sink.FrameSink | None = None
+        self.frame_index: int = 0
+
+        self.position_params: tuple[_typing.Any, _typing.Any] = (None, None)
+
+def get_state() -> RendererState:
+    """Capture the state of the active board. The returned state shares its containers with the renderer until another state is set."""
+    state = RendererState()
+    state.display_surf = globals().get("_display_surf") # Not defined before init
+    state.clock = globals().get("_clock")
+
+    state.renderers = _renderers
+    state.immediate_renders = _immediate_renders
+    state.deferred_renders = _deferred_renders
+    state.deferred_sequence = _deferred_sequence
+    state.pending_deferred = _pending_deferred
+    state.rerender_renders = _rerender_renders
+
+    state.element_index = _element_index
+    state.element_index_size = _element_index_size
+
+    state.initialized = _initialized
+    state.background = _background
+
+    state.offscreen = _offscreen
+    state.sink = _sink
+    state.frame_index = _frame_index
+
+    state.position_params = _elements.position_params.get_state()
+    return state
+
+def set_state(state: RendererState) -> None:
+    """Make `state` the active board state. Save the previous state with `get_state` first."""
+    global _display_surf, _clock, _renderers, _immediate_renders, _deferred_renders, _deferred_sequence, _pending_deferred, _rerender_renders
+    global _element_index, _element_index_size, _initialized, _background, _offscreen, _sink, _frame_index
+
+    if state.display_surf is not None:
+        _display_surf = state.display_surf
+    if state.clock is not None:
+        _clock = state.clock
+
+    _renderers = state.renderers
+    _immediate_renders = state.immediate_renders
+    _deferred_renders = state.deferred_renders
+    _deferred_sequence = state.deferred_sequence
+    _pending_deferred = state.pending_deferred
+    _rerender_renders = state.rerender_renders
+
+    _element_index = state.element_index
+    _element_index_size = state.element_index_size
+
+    _initialized = state.initialized
+    _background = state.background
+
+    _offscreen = state.offscreen
+    _sink = state.sink
+    _frame_index = state.frame_index
+
+    _elements.position_params.set_state(state.position_params)
+
+def init(size: tuple[int, int], flags: int, *, offscreen: bool = False, sink: _frame_sink.FrameSink | None = None):
+    """
+    `offscreen` renders into a surface with the given size instead of the window.
+    The video driver should be set to `dummy` before initializing pygame if no display is available.
 
-    _display_surf = _pygame.display.set_mode(size, flags)
+    `sink` receives every frame that changed the display surface.
+    """
+    global _display_surf, _clock, _initialized, _offscreen, _sink
+
+    _offscreen = offscreen
+    _sink = sink
+
+    if offscreen:
+        # A video mode is still required for Surface.convert() and Surface.convert_alpha()
+        _pygame.display.set_mode((1, 1), 0, 32)
+        _display_surf = _pygame.Surface(size, 0, 32)
+    else:
+        _pygame.display.set_caption(_constants.APP_DISPLAYNAME)
+        _pygame.display.set_icon(_pygame.image.load("resources/textures/icon.png"))
+        _display_surf = _pygame.display.set_mode(size, flags)
     _clock = _pygame.time.Clock()
 
+    _elements.position_params.set_display_size(get_size())
+
     for r in _renderers:
         r.setup()
 
@@ -56,6 +219,12 @@ def init(size: tuple[int, int], flags: int):
 
     _initialized = True
 
+def quit():
+    global _sink
+    if _sink is not None:
+        _sink.close()
+        _sink = None
+
 
 def get_fps(round_to_digits: int | None = None) -> float:
     """Compute the clock framerate (in frames per second) by averaging the last ten calls to `clock.tick()`."""
@@ -106,19 +275,35 @@ def add_renderer(renderer: _elements.ElementRenderer) -> None:
 
     _renderers += (renderer,)
 
-def force_rerender(*, rect: _pygame.Rect | None = None, size: tuple[int, int] | None = None, ignore_elements: _typing.Sequence[_elements.ElementRenderer] | None = None) -> None:
-    global _rerender_renders, _background
-
-    def should_be_forced(renderer: _elements.ElementRenderer) -> bool:
-        if ignore_elements is not None and renderer in ignore_elements:
-            return False
-
-        if rect is None or rect.colliderect(renderer.get_rect()):
-            return True
+def _rebuild_element_index() -> None:
+    global _element_index_size
+    rebuild_start: int = _perf_counter_ns()
+    _element_index.rebuild([(renderer, renderer.get_rect()) for renderer in _renderers])
+    _element_index_size = get_size()
+    _debug.set_custom_field("element_index_rebuild", "Element Index Rebuild", f"{(_perf_counter_ns() - rebuild_start) / 1_000_000:.3f} ms")
 
-        return False
-
-    to_rerender: tuple[_elements.ElementRenderer, ...] = tuple(renderer for renderer in _renderers if should_be_forced(renderer))
+def force_rerender(*, rect: _pygame.Rect | None = None, size: tuple[int, int] | None = None, ignore_elements: _typing.Sequence[_elements.ElementRenderer] | None = None) -> None:
+    global _rerender_renders, _background, _element_index_size
+
+    if size is not None:
+        _elements.position_params.set_display_size(size)
+        if size != _element_index_size:
+            _element_index_size = None
+            _surface_pool.clear() # Element sizes change with the display size
+            _textures.invalidate_scaled()
+
+    candidates: _typing.Iterable[_elements.ElementRenderer]
+    if rect is None:
+        candidates = _renderers
+    else:
+        if _element_index_size is None:
+            _rebuild_element_index()
+
+        query_start: int = _perf_counter_ns()
+        candidates = _element_index.query(rect)
+        _debug.set_custom_field("element_index_query", "Element Index Query", f"{(_perf_counter_ns() - query_start) / 1_000_000:.3f} ms")
+
+    to_rerender: tuple[_elements.ElementRenderer, ...] = tuple(renderer for renderer in candidates if ignore_elements is None or renderer not in ignore_elements)
     _rerender_renders.extend(to_rerender)
 
     msg_rnd: list[str] = [f"{len(to_rerender)} display elements."]
@@ -127,23 +312,45 @@ def force_rerender(*, rect: _pygame.Rect | None = None, size: tuple[int, int] |
         msg_rnd.insert(0, "background")
     _logging.debug(f"Forced rendering of {' and '.join(msg_rnd)}.", stack_info=False)
 
+def get_next_deadline(now: _datetime.datetime) -> _datetime.datetime | None:
+    """The time when the next frame should be rendered. `None` if nothing is scheduled."""
+    if _background is None or len(_immediate_renders) > 0 or len(_rerender_renders) > 0:
+        return now
+
+    _discard_superseded_deferred()
+    deadline: _datetime.datetime | None = _deferred_renders[0][0] if len(_deferred_renders) > 0 else None
+
+    for renderer in _renderers:
+        next_update: _datetime.datetime | None = renderer.get_next_update(now)
+        if next_update is not None and (deadline is None or next_update < deadline):
+            deadline = next_update
+
+    return deadline
+
 def update(context: _elements.UpdateContext):
     global _background
 
     for renderer in _renderers:
-        if renderer.update(context):
+        update_start: int = _perf_counter_ns()
+        changed: bool = renderer.update(context)
+        _debug.element_timings.record(renderer, "update", _perf_counter_ns() - update_start)
+
+        if changed:
             _immediate_renders.append(renderer)
 
 def render(now: _datetime.datetime, framerate: int = -1):
     global _background, _immediate_renders, _rerender_renders
+    background_changed: bool = False
     if _background is None:
         _logging.debug("Rendering background...", stack_info=False)
         _background = _nysse_background.generate_background(get_size())
         _display_surf.blit(_background, (0, 0))
-        _pygame.display.flip()
+        if not _offscreen:
+            _pygame.display.flip()
+        background_changed = True
 
-    render_rects: list[_pygame.Rect] = []
-    render_rects.extend(_render_immediate(now, _background))
+    jobs: list[_RenderJob] = []
+    _render_immediate(jobs)
 
     rerender_iterations: int = 0
     while len(_rerender_renders) > 0:
@@ -152,64 +359,171 @@ def render(now: _datetime.datetime, framerate: int = -1):
 
         _immediate_renders.extend(rerender for rerender in _rerender_renders)
         _rerender_renders.clear()
-        render_rects.extend(_render_immediate(now, _background))
+        _render_immediate(jobs)
 
         rerender_iterations += 1
 
-    render_rects.extend(_render_deferred(now, _background))
-
-    _debug.set_custom_field("render_count", "Render Count", len(render_rects))
-    _pygame.display.update(render_rects)
+    visible_jobs: list[_RenderJob] = _cull_covered_jobs(jobs)
+
+    # Surfaces that are no longer needed after this frame's blits.
+    # Released only after flushing the batch as a released surface might be borrowed again before that.
+    finished: list[_pygame.Surface] = []
+    visible_job_ids: set[int] = {id(job) for job in visible_jobs}
+    finished.extend(job.surface for job in jobs if job.surface is not None and id(job) not in visible_job_ids)
+
+    damage: _DamageRegion = _DamageRegion(get_size())
+    batch: _BlitBatch = _BlitBatch(_display_surf, _debug.blit_batching_enabled)
+    for job in visible_jobs:
+        blit_start: int = _perf_counter_ns()
+        if _render(batch, job.surface, job.rect, job.flags, _background, True, job.debug_color) and job.surface is not None:
+            _schedule_deferred(_DeferredRender(now + _datetime.timedelta(seconds=0.2), job.surface, job.rect, job.flags, job.element_ref, job.debug_color))
+        elif job.surface is not None:
+            finished.append(job.surface)
+        _record_blit(batch, job.element_ref, blit_start)
+        damage.add(job.rect)
+
+    for rect in _render_deferred(batch, now, _background, finished):
+        damage.add(rect)
+
+    batch.flush()
+    _report_blit_batch(batch)
+
+    for surface in finished:
+        _surface_pool.release(surface)
+
+    update_rects: list[_pygame.Rect] = damage.get_rects()
+
+    _debug.set_custom_field("render_count", "Render Count", f"{len(visible_jobs)} ({len(jobs) - len(visible_jobs)} culled)")
+    _debug.set_custom_field("damage", "Damage", f"{damage.get_pixel_count()} px in {len(update_rects)} rects")
+    if not _offscreen:
+        _pygame.display.update(update_rects)
+    if _sink is not None and (background_changed or len(update_rects) > 0):
+        _write_frame()
     _clock.tick(framerate) # clock.tick after update because no time sensitive functionality after display update
 
-def _render_immediate(now: _datetime.datetime, background: _pygame.Surface) -> _typing.Iterator[_pygame.Rect]:
-    global _deferred_renders, _immediate_renders
+def _record_blit(batch: _BlitBatch, element: _elements.ElementRenderer, blit_start: int) -> None:
+    # Batched blits are issued together on flush so their cost cannot be attributed to a single element.
+    # The flush time is reported in the blit batch debug field instead.
+    if batch.batched:
+        return
+    _debug.element_timings.record(element, "blit", _perf_counter_ns() - blit_start)
+
+def _report_blit_batch(batch: _BlitBatch) -> None:
+    if batch.count < 1:
+        return
+
+    batched: bool = batch.batched
+    _blit_cost_samples[batched].append(batch.elapsed_ns // batch.count)
+
+    message: str = f"{batch.count} blits in {batch.elapsed_ns / 1_000_000:.3f} ms ({'batched' if batched else 'unbatched'})"
+    batched_samples: list[int] = _blit_cost_samples[True].values()
+    unbatched_samples: list[int] = _blit_cost_samples[False].values()
+    if len(batched_samples) > 0 and len(unbatched_samples) > 0:
+        saved_per_blit: float = (sum(unbatched_samples) / len(unbatched_samples)) - (sum(batched_samples) / len(batched_samples))
+        message += f", batching saves {saved_per_blit * batch.count / 1_000_000:.3f} ms"
+    _debug.set_custom_field("blit_batch", "Blits", message)
+
+def _write_frame():
+    global _frame_index
+    assert _sink is not None
+    _sink.write(_display_surf, _frame_index)
+    _frame_index += 1
+
+def _render_immediate(jobs: list[_RenderJob]) -> None:
+    """Render all elements requesting an immediate render and append their output to `jobs`. Nothing is drawn onto the display yet."""
+    global _immediate_renders
     for renderer in _immediate_renders:
         flags: _elements.RenderFlags = _elements.RenderFlags()
         rect: _pygame.Rect = renderer.get_rect()
+        _cancel_deferred(renderer) # Superseded by this render
+        render_start: int = _perf_counter_ns()
         rnd: _pygame.Surface | None = renderer.render(rect.size, flags)
-        debug_col: tuple[int, int, int] = _get_debug_color(renderer)
-        if _render(rnd, rect, flags, renderer, background, True, debug_col) and rnd is not None:
-            scheduled: _DeferredRender = _DeferredRender(now + _datetime.timedelta(seconds=0.2), rnd, rect, flags, renderer, debug_col)
-            _deferred_renders.append(scheduled)
-        yield rect
+        _debug.element_timings.record(renderer, "render", _perf_counter_ns() - render_start)
+        if flags.rerender_colliding_elements:
+            force_rerender(rect=rect, size=get_size(), ignore_elements=(renderer,))
+
+        jobs.append(_RenderJob(rnd, rect, flags, renderer, _get_debug_color(renderer)))
 
     _immediate_renders.clear()
 
-def _render_deferred(now: _datetime.datetime, background: _pygame.Surface) -> _typing.Iterator[_pygame.Rect]:
-    global _deferred_renders
-    for deferred in _deferred_renders.copy():
-        if deferred.render_time > now: # If still in future
+def _is_opaque(job: _RenderJob) -> bool:
+    """Does this job overwrite every pixel of its rect?"""
+    if job.flags.clear_background or _debug.render_enabled:
+        return True
+
+    surf: _pygame.Surface | None = job.surface
+    if surf is None:
+        return False
+    return (surf.get_flags() & _pygame.SRCALPHA) == 0 and surf.get_colorkey() is None and surf.get_alpha() is None
+
+def _cull_covered_jobs(jobs: list[_RenderJob]) -> list[_RenderJob]:
+    """Remove jobs that would be completely overwritten by a later opaque job in the same frame. Order is preserved."""
+    covering: list[_pygame.Rect] = []
+    visible: list[_RenderJob] = []
+    for job in reversed(jobs):
+        if any(cover.contains(job.rect) for cover in covering):
+            continue
+
+        visible.append(job)
+        if _is_opaque(job):
+            covering.append(job.rect)
+
+    visible.reverse()
+    return visible
+
+def _schedule_deferred(deferred: _DeferredRender) -> None:
+    sequence: int = next(_deferred_sequence)
+    _pending_deferred[deferred.element_ref] = sequence # Replaces any older deferred render of the same element
+    _heapq.heappush(_deferred_renders, (deferred.render_time, sequence, deferred))
+
+def _cancel_deferred(element: _elements.ElementRenderer) -> None:
+    _pending_deferred.pop(element, None)
+
+def _is_superseded(sequence: int, deferred: _DeferredRender) -> bool:
+    return _pending_deferred.get(deferred.element_ref) != sequence
+
+def _discard_superseded_deferred() -> None:
+    while len(_deferred_renders) > 0 and _is_superseded(_deferred_renders[0][1], _deferred_renders[0][2]):
+        _, _, deferred = _heapq.heappop(_deferred_renders)
+        _surface_pool.release(deferred.surface)
+
+def _render_deferred(batch: _BlitBatch, now: _datetime.datetime, background: _pygame.Surface, finished: list[_pygame.Surface]) -> _typing.Iterator[_pygame.Rect]:
+    """Surfaces of the rendered and superseded deferred renders are appended to `finished`."""
+    while len(_deferred_renders) > 0 and _deferred_renders[0][0] <= now:
+        _, sequence, deferred = _heapq.heappop(_deferred_renders)
+        finished.append(deferred.surface)
+        if _is_superseded(sequence, deferred):
             continue
+        del _pending_deferred[deferred.element_ref]
 
-        _deferred_renders.remove(deferred)
-        append_deferred: bool = _render(deferred.surface, deferred.rect, deferred.flags, deferred.element_ref, background, False, deferred.debug_color)
+        blit_start: int = _perf_counter_ns()
+        append_deferred: bool = _render(batch, deferred.surface, deferred.rect, deferred.flags, background, False, deferred.debug_color)
+        _record_blit(batch, deferred.element_ref, blit_start)
         assert append_deferred == False
 
         yield deferred.rect
 
-def _clear_background(rect: _pygame.Rect, background: _pygame.Surface, debug_color: tuple[int, int, int]):
+def _clear_background(batch: _BlitBatch, rect: _pygame.Rect, background: _pygame.Surface, debug_color: tuple[int, int, int]):
     bkgrnd: _pygame.Surface = background.subsurface(rect.clip((0, 0, *background.get_size())))
     if _debug.rect_enabled:
         debug_bkgrnd = _pygame.Surface(rect.size)
         debug_bkgrnd.fill(debug_color)
         bkgrnd = debug_bkgrnd
 
-    _display_surf.blit(bkgrnd, rect.topleft)
+    batch.blit(bkgrnd, rect.topleft)
 
-def _render(render: _pygame.Surface | None, rect: _pygame.Rect, flags: _elements.RenderFlags, element_ref: _elements.ElementRenderer, background: _pygame.Surface, allow_debug: bool, debug_color: tuple[int, int, int]) -> bool:
+def _render(batch: _BlitBatch, render: _pygame.Surface | None, rect: _pygame.Rect, flags: _elements.RenderFlags, background: _pygame.Surface, allow_debug: bool, debug_color: tuple[int, int, int]) -> bool:
     if flags.clear_background:
-        _clear_background(rect, background, debug_color)
-    if flags.rerender_colliding_elements:
-        force_rerender(rect=rect, size=get_size(), ignore_elements=(element_ref,))
+        _clear_background(batch, rect, background, debug_color)
 
     if _debug.render_enabled == True and allow_debug:
         render_update_debug_col: tuple[int, int, int] = (255, 0, 0) if flags.clear_background else (0, 0, 255)
+        batch.flush()
         _pygame.draw.rect(_display_surf, render_update_debug_col, rect)
         return True
 
     if render is not None:
         assert render.get_size() == rect.size
-        _display_surf.blit(render, rect.topleft)
+        batch.blit(render, rect.topleft)
 
     return False
@@ -0,0 +1,53 @@
+from typing import Generic, Sequence, TypeVar
+import pygame
+
+_T = TypeVar("_T")
+
+class RectGrid(Generic[_T]):
+    def __init__(self, cell_size: int = 64) -> None:
+        """
+        Uniform grid of rects for fast collision queries.
+
+        The grid is a snapshot. Rects changed after `rebuild` are not noticed until the next rebuild.
+        """
+        assert cell_size > 0
+        self._cell_size: int = cell_size
+        self._items: list[tuple[_T, pygame.Rect]] = []
+        self._cells: dict[tuple[int, int], list[int]] = {}
+
+    def _cell_range(self, rect: pygame.Rect) -> tuple[range, range]:
+        # right and bottom are exclusive
+        xs = range(rect.left // self._cell_size, (rect.right - 1) // self._cell_size + 1)
+        ys = range(rect.top // self._cell_size, (rect.bottom - 1) // self._cell_size + 1)
+        return xs, ys
+
+    def rebuild(self, items: Sequence[tuple[_T, pygame.Rect]]) -> None:
+        self._items = list(items)
+        self._cells.clear()
+
+        for index, (_, rect) in enumerate(self._items):
+            if rect.width < 1 or rect.height < 1:
+                continue
+
+            xs, ys = self._cell_range(rect)
+            for x in xs:
+                for y in ys:
+                    self._cells.setdefault((x, y), []).append(index)
+
+    def query(self, rect: pygame.Rect) -> list[_T]:
+        """Return all items colliding with `rect` in the order they were given to `rebuild`."""
+        if rect.width < 1 or rect.height < 1:
+            return []
+
+        candidates: set[int] = set()
+        xs, ys = self._cell_range(rect)
+        for x in xs:
+            for y in ys:
+                cell: list[int] | None = self._cells.get((x, y))
+                if cell is not None:
+                    candidates.update(cell)
+
+        return [self._items[i][0] for i in sorted(candidates) if rect.colliderect(self._items[i][1])]
+
+    def __len__(self) -> int:
+        return len(self._items)
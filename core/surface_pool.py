@@ -0,0 +1,69 @@
+import weakref as _weakref
+import pygame as _pygame
+
+_MAX_FREE_PER_KEY: int = 16
+
+class _Loan:
+    def __init__(self, key: tuple[tuple[int, int], int]) -> None:
+        self.key: tuple[tuple[int, int], int] = key
+        self.references: int = 1
+
+_free: dict[tuple[tuple[int, int], int], list[_pygame.Surface]] = {}
+_borrowed: "_weakref.WeakKeyDictionary[_pygame.Surface, _Loan]" = _weakref.WeakKeyDictionary()
+"""Every surface that is currently lent out. Surfaces that are never released are dropped when garbage collected."""
+
+_hits: int = 0
+_misses: int = 0
+
+def borrow(size: tuple[int, int], flags: int = 0) -> _pygame.Surface:
+    """
+    Borrow a cleared surface with the given size and flags.
+
+    Surfaces returned by `ElementRenderer.render` are released by the renderer once they have been drawn.
+    Elements that keep a reference to a rendered surface must `retain` it and `release` it once they drop it.
+    """
+    global _hits, _misses
+
+    key: tuple[tuple[int, int], int] = ((size[0], size[1]), flags)
+    free: list[_pygame.Surface] | None = _free.get(key)
+
+    surf: _pygame.Surface
+    if free is not None and len(free) > 0:
+        surf = free.pop()
+        surf.fill((0, 0, 0, 0))
+        _hits += 1
+    else:
+        surf = _pygame.Surface(key[0], flags)
+        _misses += 1
+
+    _borrowed[surf] = _Loan(key)
+    return surf
+
+def retain(surface: _pygame.Surface) -> None:
+    """Add a reference to a borrowed surface. Every `retain` must be paired with a `release`. Does nothing if the surface was not borrowed from the pool."""
+    loan: _Loan | None = _borrowed.get(surface)
+    if loan is not None:
+        loan.references += 1
+
+def release(surface: _pygame.Surface) -> None:
+    """Remove a reference to a borrowed surface. The surface is returned to the pool once no references remain. Does nothing if the surface was not borrowed from the pool."""
+    loan: _Loan | None = _borrowed.get(surface)
+    if loan is None:
+        return
+
+    loan.references -= 1
+    if loan.references > 0:
+        return
+
+    del _borrowed[surface]
+    free: list[_pygame.Surface] = _free.setdefault(loan.key, [])
+    if len(free) < _MAX_FREE_PER_KEY:
+        free.append(surface)
+
+def clear() -> None:
+    """Drop all free surfaces. Borrowed surfaces can still be released afterwards."""
+    _free.clear()
+
+def get_stats() -> tuple[int, int, int]:
+    """Hit count, miss count and the number of free surfaces."""
+    return _hits, _misses, sum(len(free) for free in _free.values())
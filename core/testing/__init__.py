@@ -1,2 +1,3 @@
 from core.testing.stopwatch import Stopwatch as Stopwatch
 from core.testing.time_this_decorator import time_this as time_this
+from core.testing import benchmark as benchmark
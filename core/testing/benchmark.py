@@ -0,0 +1,162 @@
+import datetime as _datetime
+import itertools as _itertools
+import os as _os
+import sys as _sys
+import multiprocessing as _multiprocessing
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+from time import perf_counter_ns as _perf_counter_ns
+from typing import Any as _Any, NamedTuple as _NamedTuple, Sequence as _Sequence
+
+DEFAULT_WINDOW_SIZES: tuple[tuple[int, int], ...] = ((360, 640), (720, 1280), (1080, 1920))
+DEFAULT_DEPARTURE_COUNTS: tuple[int, ...] = (5, 10)
+
+BASE_TIME: _datetime.datetime = _datetime.datetime(2023, 1, 16, 11, 59, 40)
+"""Fixed so that every run renders the same values. The first minute rollover happens 20 seconds after this."""
+
+_HEADSIGNS: tuple[str, ...] = ("Keskustori", "Hervanta", "TAYS Arvo", "Pirkkala", "Lentävänniemi", "Hatanpää", "Kaleva", "Nekala")
+
+class Scenario(_NamedTuple):
+    window_size: tuple[int, int]
+    departure_count: int
+    steady_frames: int = 120
+    rollover_frames: int = 30
+
+def create_scenarios(window_sizes: _Sequence[tuple[int, int]] = DEFAULT_WINDOW_SIZES, departure_counts: _Sequence[int] = DEFAULT_DEPARTURE_COUNTS, steady_frames: int = 120, rollover_frames: int = 30) -> list[Scenario]:
+    return [Scenario(size, count, steady_frames, rollover_frames) for size, count in _itertools.product(window_sizes, departure_counts)]
+
+def create_stop(departure_count: int, now: _datetime.datetime = BASE_TIME) -> _Any:
+    """Synthetic stop with a mix of realtime countdowns, scheduled times and cancellations."""
+    from digitransit import routing # Imported lazily so that the parent process does not need to import pygame
+
+    midnight: _datetime.datetime = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    service_day: int = round(midnight.timestamp())
+    seconds_into_day: int = round((now - midnight).total_seconds())
+
+    stoptimes: list[dict[str, _Any]] = []
+    for i in range(departure_count):
+        departure: int = seconds_into_day + 90 + i * 150 # Countdowns cross minute boundaries at different times
+        realtime: bool = i % 4 != 3
+        state: str = "CANCELED" if i % 7 == 6 else ("UPDATED" if realtime else "SCHEDULED")
+        shortname: str = str(1 + (i * 3) % 40)
+        stoptimes.append({
+            "scheduledArrival": departure,
+            "realtimeArrival": departure + 30,
+            "arrivalDelay": 30,
+            "scheduledDeparture": departure,
+            "realtimeDeparture": departure + 30,
+            "departureDelay": 30,
+            "realtime": realtime,
+            "realtimeState": state,
+            "serviceDay": service_day,
+            "headsign": _HEADSIGNS[i % len(_HEADSIGNS)],
+            "trip": {
+                "gtfsId": f"tampere:bench_trip_{i}",
+                "pattern": {"code": f"tampere:bench_pattern_{shortname}"},
+                "route": {
+                    "gtfsId": f"tampere:bench_route_{shortname}",
+                    "shortName": shortname,
+                    "longName": f"Benchmark route {shortname}",
+                    "mode": "BUS"
+                }
+            }
+        })
+
+    return routing.Stop("tampere:3522", "Benchmark", "3522", "BUS", 61.4981, 23.7610, stoptimes)
+
+def _stats(values_ns: list[int]) -> dict[str, float]:
+    from core.debug.element_timings import TimingStats
+
+    stats = TimingStats(sorted(values_ns))
+    return {"count": stats.count, "p50": stats.p50, "p95": stats.p95, "max": stats.max}
+
+def _run_scenario(scenario: Scenario) -> dict[str, _Any]:
+    """Run in a fresh process as the renderer and element state are module-global."""
+    _sys.stdout = _sys.stderr # Keep stdout clean for the results
+
+    _os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
+    _os.environ["SDL_VIDEODRIVER"] = "dummy"
+    import pygame
+    import main
+    from core import config, debug, elements, font_helper, render_info, renderer
+    from nysse import background_generator
+
+    background_generator.disk_cache_enabled = False # The first frame must not depend on a cache left behind by earlier runs
+
+    config.current = config.Config(window_size=scenario.window_size, departure_count=scenario.departure_count, headless=True)
+    render_info.init()
+    render_info.active.stopinfo = create_stop(scenario.departure_count)
+
+    main.initialize_renderers()
+    pygame.init()
+    renderer.init(scenario.window_size, 0, offscreen=True)
+
+    def frame(time: _datetime.datetime) -> int:
+        start: int = _perf_counter_ns()
+        renderer.update(elements.UpdateContext(time, render_info.active.stopinfo))
+        renderer.render(time)
+        return _perf_counter_ns() - start
+
+    now: _datetime.datetime = BASE_TIME
+    first_frame: int = frame(now)
+
+    debug.element_timings.clear() # Per-element timings should not contain the first frame
+
+    steady: list[int] = []
+    for _ in range(scenario.steady_frames):
+        now += _datetime.timedelta(milliseconds=100)
+        steady.append(frame(now))
+
+    rollover: list[int] = []
+    for _ in range(scenario.rollover_frames):
+        now = now.replace(second=0, microsecond=0) + _datetime.timedelta(minutes=1)
+        rollover.append(frame(now))
+
+    pygame.quit()
+
+    return {
+        "window_size": list(scenario.window_size),
+        "departure_count": scenario.departure_count,
+        "first_frame_ms": first_frame / 1_000_000,
+        "steady_state_ms": _stats(steady),
+        "minute_rollover_ms": _stats(rollover),
+        "font_loads": font_helper.get_load_counts(),
+        "elements": {
+            label: {phase: {"p50": s.p50, "p95": s.p95, "max": s.max} for phase, s in stats.items()}
+            for label, stats in debug.element_timings.get_stats().items()
+        }
+    }
+
+def run(scenarios: _Sequence[Scenario]) -> list[dict[str, _Any]]:
+    """Run each scenario in its own process and return the results in the same order."""
+    results: list[dict[str, _Any]] = []
+    context = _multiprocessing.get_context("spawn")
+    for scenario in scenarios:
+        # A new executor for every scenario so that no state leaks between them
+        with _ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(_run_scenario, scenario).result())
+    return results
+
+def _scenario_key(result: dict[str, _Any]) -> tuple[int, int, int]:
+    return (result["window_size"][0], result["window_size"][1], result["departure_count"])
+
+def find_regressions(results: _Sequence[dict[str, _Any]], baseline: _Sequence[dict[str, _Any]], tolerance: float) -> list[str]:
+    """Compare median frame costs against `baseline`. A frame type regresses if it is over `tolerance` (fraction) slower."""
+    baseline_by_key: dict[tuple[int, int, int], dict[str, _Any]] = {_scenario_key(b): b for b in baseline}
+
+    regressions: list[str] = []
+    for result in results:
+        base: dict[str, _Any] | None = baseline_by_key.get(_scenario_key(result))
+        if base is None:
+            continue
+
+        comparisons: tuple[tuple[str, float, float], ...] = (
+            ("first frame", result["first_frame_ms"], base["first_frame_ms"]),
+            ("steady state p50", result["steady_state_ms"]["p50"], base["steady_state_ms"]["p50"]),
+            ("minute rollover p50", result["minute_rollover_ms"]["p50"], base["minute_rollover_ms"]["p50"])
+        )
+        for name, value, base_value in comparisons:
+            if base_value > 0 and value > base_value * (1 + tolerance):
+                w, h, count = _scenario_key(result)
+                regressions.append(f"{w}x{h}, {count} departures: {name} {base_value:.3f} ms => {value:.3f} ms")
+
+    return regressions
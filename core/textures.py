@@ -0,0 +1,74 @@
+import pygame as _pygame
+from core import logging as _logging
+
+_MAX_SCALED_PER_TEXTURE: int = 8
+
+_textures: dict[str, _pygame.Surface] = {}
+_scaled: dict[str, dict[tuple[int, int], _pygame.Surface]] = {}
+
+def load(path: str) -> _pygame.Surface:
+    """
+    Load the texture at `path` once and return the same surface on subsequent calls.
+
+    The returned surface is shared. Copy it before drawing onto it.
+    """
+    texture: _pygame.Surface | None = _textures.get(path)
+    if texture is None:
+        texture = _pygame.image.load(path).convert_alpha()
+        _textures[path] = texture
+    return texture
+
+def get_scaled(path: str, size: tuple[int, int]) -> _pygame.Surface:
+    """
+    Smoothscaled variant of the texture at `path`. Variants are kept until `invalidate_scaled` is called.
+
+    The returned surface is shared. Copy it before drawing onto it.
+    """
+    size = (size[0], size[1])
+    variants: dict[tuple[int, int], _pygame.Surface] = _scaled.setdefault(path, {})
+
+    scaled: _pygame.Surface | None = variants.get(size)
+    if scaled is None:
+        if len(variants) >= _MAX_SCALED_PER_TEXTURE:
+            variants.clear()
+        scaled = _pygame.transform.smoothscale(load(path), size)
+        variants[size] = scaled
+    return scaled
+
+def get_scaled_to_height(path: str, height: int) -> _pygame.Surface:
+    """Scaled variant of the texture at `path` that preserves the aspect ratio."""
+    texture: _pygame.Surface = load(path)
+    width: int = round(texture.get_width() / texture.get_height() * height)
+    return get_scaled(path, (width, height))
+
+def invalidate_scaled() -> None:
+    """Drop all scaled variants. Called when the display is resized as all element sizes change."""
+    _scaled.clear()
+
+def _get_surface_bytes(surface: _pygame.Surface) -> int:
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+def get_memory_usage() -> dict[str, int]:
+    """Bytes held by each texture and its scaled variants keyed by texture path."""
+    usage: dict[str, int] = {path: _get_surface_bytes(texture) for path, texture in _textures.items()}
+    for path, variants in _scaled.items():
+        usage[path] = usage.get(path, 0) + sum(_get_surface_bytes(variant) for variant in variants.values())
+    return usage
+
+def get_report() -> str:
+    lines: list[str] = [f"{'Texture':<64}{'Variants':>10}{'Memory (KB)':>14}"]
+    for path, memory in sorted(get_memory_usage().items(), key=lambda item: item[1], reverse=True):
+        lines.append(f"{path:<64}{len(_scaled.get(path, {})):>10}{memory / 1024:>14.1f}")
+    return "\n".join(lines)
+
+def export() -> None:
+    message_lines = (
+        "",
+        "I=========================[ EXPORTED TEXTURE MEMORY ]=========================I",
+        "",
+        get_report(),
+        "",
+        "I=========================[ EXPORTED TEXTURE MEMORY ]=========================I",
+    )
+
+    _logging.debug("\n".join(message_lines), stack_info=False)
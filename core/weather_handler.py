@@ -1,9 +1,8 @@
 import datetime
-import threading
 import fmiopendata.multipoint
 from typing import Any, Callable, Iterable, NamedTuple
 
-from core import datetime_utils
+from core import datetime_utils, fetch_loop, textures
 
 import pygame
 
@@ -18,28 +17,26 @@ class WeatherFetchParams(NamedTuple):
     duration: datetime.timedelta
     timestep_minutes: int | None = None
 
-_cached_symbols: dict[int, pygame.Surface] = {}
+def get_weather_symbol_path(symbol_id: int) -> str:
+    return f"resources/textures/weather_symbols/png/{symbol_id}.png"
+
 def get_weather_symbol(symbol_id: int) -> pygame.Surface:
     """
-    Get the texture of the weather symbol.
+    Get the texture of the weather symbol. The returned surface is shared.
     """
-    if symbol_id not in _cached_symbols:
-        _cached_symbols[symbol_id] = pygame.image.load(f"resources/textures/weather_symbols/png/{symbol_id}.png").convert_alpha()
-    return _cached_symbols[symbol_id]
+    return textures.load(get_weather_symbol_path(symbol_id))
 
 def get_weather(fmi_place: str, params: WeatherFetchParams, on_finish: Callable[[tuple[Weather]], Any]) -> None:
     """
     Get weather data from FMI.
     """
-    provider = _WeatherRequestProvider(fmi_place, params, on_finish)
-    request_thread = threading.Thread(target=provider.get_weather, name=f"WeatherRequest_{fmi_place}", daemon=False)
-    request_thread.start()
+    provider = _WeatherRequestProvider(fmi_place, params)
+    fetch_loop.submit(f"WeatherRequest_{fmi_place}", provider.get_weather, on_result=on_finish)
 
-class _WeatherRequestProvider: # HACK: Passing arguments on thread start ignores type checking.
-    def __init__(self, fmi_place: str, params: WeatherFetchParams, on_finish: Callable[[tuple[Weather]], Any]) -> None:
+class _WeatherRequestProvider:
+    def __init__(self, fmi_place: str, params: WeatherFetchParams) -> None:
         self.fmi_place: str = fmi_place
         self.params: WeatherFetchParams = params
-        self.on_finish: Callable[[tuple[Weather]], Any] = on_finish
 
     def _parse_multipoint(self, mp: fmiopendata.multipoint.MultiPoint) -> Iterable[Weather]:
         datapoints = list(mp.data.items())
@@ -65,11 +62,11 @@ class _WeatherRequestProvider: # HACK: Passing arguments on thread start ignores
             assert isinstance(symbol, float)
             symbol = int(symbol)
 
-            local_time = datetime_utils.utc2local(time) # Slow to call each parsing, but this shit is threaded anyways :D
+            local_time = datetime_utils.utc2local(time) # Slow to call each parsing, but this runs on the fetch loop anyways :D
             wt = Weather(time, local_time, temperature, symbol)
             yield wt
 
-    def get_weather(self) -> None:
+    def get_weather(self) -> tuple[Weather, ...]:
         starttime = self.params.starttime
         endtime: datetime.datetime = starttime + self.params.duration
 
@@ -87,4 +84,4 @@ class _WeatherRequestProvider: # HACK: Passing arguments on thread start ignores
         )
         parsed = self._parse_multipoint(mp)
 
-        self.on_finish(tuple(parsed)) # Converting to a tuple so that we don't iterate between threads and such
+        return tuple(parsed) # Converting to a tuple so that we don't iterate between threads and such
@@ -1,11 +1,24 @@
 from typing import Any, Callable, NamedTuple, Sequence, TypeVar, Self
 from digitransit.enums import Mode, RealtimeState
+import sys
 import json
-import requests
+import hashlib
+import threading
+from core import http_client
 from datetime import datetime
 
 _T = TypeVar("_T")
 
+class _CachedResponse(NamedTuple):
+    digest: bytes
+    value: Any
+
+_response_cache: dict[tuple[str, str], _CachedResponse] = {}
+"""Last response of each reusable request keyed by endpoint and query."""
+_response_cache_lock: threading.Lock = threading.Lock()
+_reusable_requests: int = 0
+_reused_responses: int = 0
+
 
 class Coordinate(NamedTuple):
     latitude: float
@@ -23,15 +36,26 @@ class Coordinate(NamedTuple):
 class _PatternCodeWrapper(NamedTuple):
     code: str
 
+def _intern(value: str | None) -> str | None:
+    """Identifiers and names repeat on every poll. Interning shares a single string between all of them."""
+    return sys.intern(value) if value is not None else None
+
+# Models are rebuilt on every poll. __slots__ keeps them small as they don't need a __dict__.
+
 class Alert:
-    def __init__(self, feed: str | None, alertHeaderText: str | None, alertDescriptionText: str, route: dict[str, Any] | None, stop: dict[str, Any] | None) -> None:
-        self.feed: str | None = feed
+    __slots__ = ("feed", "alertHeaderText", "alertDescriptionText", "route", "stop")
+
+    def __init__(self, feed: str | None, alertHeaderText: str | None, alertDescriptionText: str, route: dict[str, Any] | None, stop: dict[str, Any] | None, routes: dict[str, "Route"] | None = None) -> None:
+        """`routes` shares routes between alerts of the same response. Keyed by gtfsId."""
+        self.feed: str | None = _intern(feed)
         self.alertHeaderText: str | None = alertHeaderText
         self.alertDescriptionText: str = alertDescriptionText
-        self.route: Route | None = Route(**route) if route is not None else None
+        self.route: Route | None = _get_or_create_route(route, routes) if route is not None else None
         self.stop: Stop | None = Stop(**stop) if stop is not None else None
 
 class Stoptime:
+    __slots__ = ("scheduledArrival", "realtimeArrival", "arrivalDelay", "scheduledDeparture", "realtimeDeparture", "departureDelay", "realtime", "realtimeState", "headsign", "trip")
+
     def __init__(self, scheduledArrival: int | None, realtimeArrival: int | None, arrivalDelay: int | None, scheduledDeparture: int | None, realtimeDeparture: int | None, departureDelay: int | None, realtime: bool | None, realtimeState: str | None, serviceDay: int | None, headsign: str | None, trip: dict[str, Any] | None) -> None:
         self.scheduledArrival: datetime | None = datetime.fromtimestamp(serviceDay + scheduledArrival) if scheduledArrival is not None and serviceDay is not None else None
         self.realtimeArrival: datetime | None = datetime.fromtimestamp(serviceDay + realtimeArrival) if realtimeArrival is not None and serviceDay is not None else None
@@ -41,7 +65,7 @@ class Stoptime:
         self.departureDelay: int | None = departureDelay
         self.realtime: bool | None = realtime
         self.realtimeState: RealtimeState | None = RealtimeState(realtimeState)
-        self.headsign: str | None = headsign
+        self.headsign: str | None = _intern(headsign)
         self.trip: Trip | None = Trip(**trip) if trip is not None else None
 
     #region Unmaintained mock
@@ -80,10 +104,12 @@ class Stoptime:
     #endregion
 
 class Stop:
-    def __init__(self, gtfsId: str, name: str, code: str, vehicleMode: str | None, lat: float, lon: float, stoptimesWithoutPatterns: Sequence[dict[str, Any]] | None = None) -> None:
-        self.gtfsId: str = gtfsId
-        self.name: str = name
-        self.code: str = code
+    __slots__ = ("gtfsId", "name", "code", "vehicleMode", "coordinate", "stoptimes")
+
+    def __init__(self, gtfsId: str, name: str, code: str | None, vehicleMode: str | None, lat: float, lon: float, stoptimesWithoutPatterns: Sequence[dict[str, Any]] | None = None) -> None:
+        self.gtfsId: str = sys.intern(gtfsId)
+        self.name: str = sys.intern(name)
+        self.code: str | None = _intern(code)
         self.vehicleMode: Mode | None = Mode(vehicleMode) if vehicleMode is not None else None
 
         self.coordinate: Coordinate = Coordinate(latitude=lat, longitude=lon)
@@ -93,34 +119,55 @@ class Stop:
             self.stoptimes = [Stoptime(**stoptime) for stoptime in stoptimesWithoutPatterns]
 
 class Route:
+    __slots__ = ("gtfsId", "shortName", "longName", "mode", "stops")
+
     def __init__(self, gtfsId: str, shortName: str | None, longName: str | None, mode: str | None, stops: Sequence[dict[str, Any]] | None = None) -> None:
-        self.gtfsId: str = gtfsId
-        self.shortName: str | None = shortName
-        self.longName: str | None = longName
+        self.gtfsId: str = sys.intern(gtfsId)
+        self.shortName: str | None = _intern(shortName)
+        self.longName: str | None = _intern(longName)
         self.mode: Mode | None = Mode(mode) if mode is not None else None
 
         self.stops: list[Stop] | None = None
         if stops is not None:
             self.stops = [Stop(**stop) for stop in stops]
 
+def _get_or_create_route(route: dict[str, Any], routes: dict[str, Route] | None) -> Route:
+    if routes is None:
+        return Route(**route)
+
+    created: Route | None = routes.get(route["gtfsId"])
+    if created is None:
+        created = Route(**route)
+        routes[created.gtfsId] = created
+    return created
+
 class Trip:
+    __slots__ = ("gtfsId", "patternCode", "route")
+
     def __init__(self, gtfsId: str, pattern: dict[str, Any], route: dict[str, Any]) -> None:
-        self.gtfsId: str = gtfsId
-        self.patternCode: str = _PatternCodeWrapper(**pattern).code
+        self.gtfsId: str = sys.intern(gtfsId)
+        self.patternCode: str = sys.intern(_PatternCodeWrapper(**pattern).code)
         self.route: Route = Route(**route)
 
 class Pattern:
-    def __init__(self, name: str, headsign: str, route: dict[str, Any], stops: Sequence[dict[str, Any]], geometry: Sequence[dict[str, Any]]) -> None:
-        self.name: str = name
-        self.headsign: str = headsign
+    __slots__ = ("name", "headsign", "route", "stops", "geometry")
+
+    def __init__(self, name: str | None, headsign: str | None, route: dict[str, Any], stops: Sequence[dict[str, Any]], geometry: Sequence[dict[str, Any]]) -> None:
+        self.name: str | None = _intern(name)
+        self.headsign: str | None = _intern(headsign)
         self.route: Route = Route(**route)
         self.stops: list[Stop] = [Stop(**stop) for stop in stops]
         self.geometry: list[Coordinate] = [Coordinate.create_from_json(**coordinate) for coordinate in geometry]
 
 
-def get_stop_info(endpoint: str, api_key: str, stop_gtfsId: str, numberOfDepartures: int | None = None, omitNonPickups: bool | None = None, omitCanceled: bool | None = None) -> Stop:
-    query = """{
-  stop(STOPARGS) {
+class StopQuery(NamedTuple):
+    gtfsId: str
+    numberOfDepartures: int | None = None
+    omitNonPickups: bool | None = None
+    omitCanceled: bool | None = None
+
+_STOP_QUERY = """
+  ALIAS stop(STOPARGS) {
     gtfsId
     name
     code
@@ -152,13 +199,42 @@ def get_stop_info(endpoint: str, api_key: str, stop_gtfsId: str, numberOfDepartu
       }
     }
   }
-}
 """
-    query = _replace_with_arguments(query, "(STOPARGS)", ("id", stop_gtfsId))
-    query = _replace_with_arguments(query, "(TIMESARGS)", ("numberOfDepartures", numberOfDepartures), ("omitNonPickups", omitNonPickups), ("omitCanceled", omitCanceled))
+
+def _format_stop_query(stop_query: StopQuery, alias: str | None) -> str:
+    query = _STOP_QUERY.replace("ALIAS ", f"{alias}: " if alias is not None else "")
+    query = _replace_with_arguments(query, "(STOPARGS)", ("id", stop_query.gtfsId))
+    query = _replace_with_arguments(query, "(TIMESARGS)", ("numberOfDepartures", stop_query.numberOfDepartures), ("omitNonPickups", stop_query.omitNonPickups), ("omitCanceled", stop_query.omitCanceled))
+    return query
+
+def get_stop_info(endpoint: str, api_key: str, stop_gtfsId: str, numberOfDepartures: int | None = None, omitNonPickups: bool | None = None, omitCanceled: bool | None = None) -> Stop:
+    query = "{" + _format_stop_query(StopQuery(stop_gtfsId, numberOfDepartures, omitNonPickups, omitCanceled), None) + "}\n"
 
     return _make_request(endpoint, api_key, query, "stop", Stop)
 
+def get_stops_info(endpoint: str, api_key: str, stop_queries: Sequence[StopQuery], batch_size: int | None = None, reuse_unchanged: bool = False) -> list[Stop | None]:
+    """
+    Fetch multiple stops with a single request per `batch_size` stops. Every stop is an aliased `stop` field so each can have its own arguments.
+
+    Returned stops are in the same order as `stop_queries`. Stops that were not found are `None`.
+    If `reuse_unchanged` is True, the previously returned `Stop` objects of a batch are returned again when the batch's response has not changed.
+    """
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("Batch size must be at least 1.")
+
+    stops: list[Stop | None] = []
+    step: int = batch_size if batch_size is not None else max(len(stop_queries), 1)
+    for batch_start in range(0, len(stop_queries), step):
+        batch: Sequence[StopQuery] = stop_queries[batch_start:batch_start + step]
+        query = "{" + "".join(_format_stop_query(stop_query, f"stop{i}") for i, stop_query in enumerate(batch)) + "}\n"
+
+        def constructor(data: dict[str, dict[str, Any] | None]) -> list[Stop | None]:
+            return [Stop(**stop) if (stop := data[f"stop{i}"]) is not None else None for i in range(len(batch))]
+
+        stops.extend(_make_request(endpoint, api_key, query, None, constructor, reuse_unchanged=reuse_unchanged))
+
+    return stops
+
 def get_alerts(endpoint: str, api_key: str, feeds: list[str] | tuple[str, ...]) -> list[Alert]: # Apparently Sequence[str] allows the user to put in a bare string
     query = """{
   alerts(ALERTSARGS) {
@@ -193,7 +269,8 @@ def get_alerts(endpoint: str, api_key: str, feeds: list[str] | tuple[str, ...])
     query = _replace_with_arguments(query, "(ALERTSARGS)", ("feeds", feeds))
 
     def constructor(data: dict[str, list[dict[str, Any]]]) -> list[Alert]:
-        return [Alert(**params) for params in data["alerts"]]
+        routes: dict[str, Route] = {} # Many alerts share a route with all of its stops
+        return [Alert(**params, routes=routes) for params in data["alerts"]]
 
     return _make_request(endpoint, api_key, query, None, constructor)
 
@@ -228,20 +305,46 @@ def get_pattern(endpoint: str, api_key: str, pattern_code: str) -> Pattern:
     return _make_request(endpoint, api_key, query, "pattern", Pattern)
 
 
-def _make_request(endpoint: str, api_key: str, query: str, expected_data_key: str | None, constructor: Callable[..., _T]) -> _T:
+def get_response_reuse_stats() -> tuple[int, int]:
+    """Reused response count and the total count of requests that allowed reusing."""
+    with _response_cache_lock:
+        return (_reused_responses, _reusable_requests)
+
+def _make_request(endpoint: str, api_key: str, query: str, expected_data_key: str | None, constructor: Callable[..., _T], *, reuse_unchanged: bool = False) -> _T:
+    """
+    If `reuse_unchanged` is True, the response body is hashed and the previous return value of the same request is returned if the body has not changed.
+    The returned object is shared between calls in that case and must not be modified.
+    """
+    global _reusable_requests, _reused_responses
+
     jsonString = "{\"query\": " + json.dumps(query) + "}"
 
-    response = requests.post(endpoint, jsonString, headers={"content-type": "application/json", "digitransit-subscription-key": api_key})
+    response = http_client.post(endpoint, jsonString, headers={"content-type": "application/json", "digitransit-subscription-key": api_key})
     if not response.ok:
         raise RuntimeError(f"Invalid response! Response below:\n{response.content}")
 
+    cache_key: tuple[str, str] = (endpoint, query)
+    digest: bytes = b""
+    if reuse_unchanged:
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        with _response_cache_lock:
+            _reusable_requests += 1
+            cached: _CachedResponse | None = _response_cache.get(cache_key)
+            if cached is not None and cached.digest == digest:
+                _reused_responses += 1
+                return cached.value
+
     d = json.loads(response.content)
     data = d["data"]
     keydata = d if expected_data_key is None else data[expected_data_key]
     if keydata is None:
       raise ValueError(f"No data found! Expected data with key: {expected_data_key}. Response below:\n{response.content}")
 
-    return constructor(**keydata)
+    value: _T = constructor(**keydata)
+    if reuse_unchanged:
+        with _response_cache_lock:
+            _response_cache[cache_key] = _CachedResponse(digest, value)
+    return value
 
 def _replace_with_arguments(query: str, keyword: str, *args: tuple[str, object | None]) -> str:
     """None argument value is default."""
@@ -1,11 +1,14 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from types import EllipsisType
-from typing import Final, NamedTuple
+from typing import TYPE_CHECKING, Final, NamedTuple
 import pygame
 from core import elements, logging
 from nalpy import math
 
+if TYPE_CHECKING:
+    from core.render_info import BoardInfo
+
 MAX_PROGRESS_TOLERANCE: Final[float] = 1.2
 
 class EmbedContext(NamedTuple):
@@ -22,9 +25,16 @@ class EmbedContext(NamedTuple):
         return math.clamp01(self.raw_progress)
 
 class Embed(ABC):
+    board: BoardInfo
+    """The board this embed is shown on. Use this instead of `config.current` and `render_info.active` as embeds are enabled from other threads."""
+
     def __init__(self, *args: str):
         pass
 
+    def attach(self, board: BoardInfo) -> None:
+        """Called by the embed cycle after construction."""
+        self.board = board
+
     @abstractmethod
     def on_enable(self):
         pass
@@ -42,6 +52,13 @@ class Embed(ABC):
         """
         raise NotImplementedError()
 
+    def get_next_progress_update(self, progress: float) -> float | None:
+        """
+        The earliest progress value at which `update` might return changes without new data arriving from other threads.
+        Return `None` if this embed only changes when new data arrives.
+        """
+        return None
+
     @abstractmethod
     def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
         """
@@ -1,14 +1,18 @@
 from __future__ import annotations
-import threading
+from concurrent.futures import Future
 import time
 from types import EllipsisType
+from typing import TYPE_CHECKING
 
 import embeds
 import digitransit.routing
-from core import colors, config, elements, font_helper, render_info, logging, debug
+from core import colors, elements, font_helper, logging, debug, fetch_loop
 from nalpy import math
 import pygame
 
+if TYPE_CHECKING:
+    from core.render_info import BoardInfo
+
 alert_font: font_helper.SizedFont = font_helper.SizedFont("resources/fonts/OpenSans-Regular.ttf", "alert rendering")
 page_font: font_helper.SizedFont = font_helper.SizedFont("resources/fonts/OpenSans-Regular.ttf", "alert page number rendering")
 
@@ -38,31 +42,40 @@ class AlertEmbed(embeds.Embed):
         self.alert: digitransit.routing.Alert | None = None
 
         self._last_alert_update: float | None = None
-        self._first_alert_loaded: bool = False
+        self._alerts_fetch: Future[tuple[list[digitransit.routing.Alert], list[digitransit.routing.Alert]]] | None = None
 
-    def load_and_filter_alerts(self):
-        alerts = digitransit.routing.get_alerts(config.current.endpoint, config.current.api_key.value, ("tampere",))
+    def load_and_filter_alerts(self) -> tuple[list[digitransit.routing.Alert], list[digitransit.routing.Alert]]:
+        """Blocking. Returns all alerts and the alerts that pass the filters."""
+        alerts = digitransit.routing.get_alerts(self.board.config.endpoint, self.board.config.api_key.value, ("tampere",))
 
-        filtered_alerts = [alert for alert in alerts if _alert_meets_filter_requirements(alert, self.include_global, self.include_local)]
+        rendered_stop_gtfsId: str = self.board.get_stop_gtfsId()
+        filtered_alerts = [alert for alert in alerts if _alert_meets_filter_requirements(alert, self.include_global, self.include_local, rendered_stop_gtfsId)]
 
         # There seem to be duplicates during the 2022 Finnish Ice Hockey World Championship, but I don't think that normally happens...
         if self.remove_duplicates: # Remove duplicates by checking if the descriptions (the only visible part basically) are the same
             filtered_alerts = [alert for alert_index, alert in enumerate(filtered_alerts) if all(alert.alertDescriptionText != other.alertDescriptionText for other in filtered_alerts[:alert_index])]
 
-        self._alerts = alerts # Values are set here due to threading
-        self._filtered_alerts = filtered_alerts
+        return (alerts, filtered_alerts)
+
+    def _set_alerts(self, alerts: tuple[list[digitransit.routing.Alert], list[digitransit.routing.Alert]]) -> None:
+        self._alerts, self._filtered_alerts = alerts
+
+    def attach(self, board: BoardInfo) -> None:
+        super().attach(board)
+        self.load_alerts_threaded_if_necessary() # Load ahead of the first enable so that the alerts are usually available by then
+
+    def load_alerts_threaded_if_necessary(self):
+        if self._alerts_fetch is not None and not self._alerts_fetch.done():
+            return
 
-    def load_alerts_threaded_if_necessary(self, *, join: bool = False):
         now_update: float = time.time()
-        if self._last_alert_update is not None and (now_update - self._last_alert_update) < self.poll_rate:
+        # Retry immediately if the alerts have not been loaded yet (i.e. the first fetch failed)
+        if self._filtered_alerts is not None and self._last_alert_update is not None and (now_update - self._last_alert_update) < self.poll_rate:
             return
 
         logging.info(f"Loading new alert data...", stack_info=False)
 
-        t = threading.Thread(target=self.load_and_filter_alerts, name="AlertsFetch", daemon=False)
-        t.start()
-        if join:
-            t.join()
+        self._alerts_fetch = fetch_loop.submit("AlertsFetch", self.load_and_filter_alerts, on_result=self._set_alerts)
 
         self._last_alert_update = now_update
         # Not adding difference but rather setting the value
@@ -70,18 +83,18 @@ class AlertEmbed(embeds.Embed):
         # and it works nicer with the None check.
 
     def on_enable(self):
-        self.load_alerts_threaded_if_necessary(join=not self._first_alert_loaded)
-        self._first_alert_loaded = True
+        self.load_alerts_threaded_if_necessary()
 
         filtered_alerts: list[digitransit.routing.Alert] | None = self._filtered_alerts
-        assert filtered_alerts is not None
         alert: digitransit.routing.Alert | None
-        if len(filtered_alerts) > 0:
+        if filtered_alerts is not None and len(filtered_alerts) > 0:
             alert = filtered_alerts[self._alert_index % len(filtered_alerts)]
         else:
             alert = None
 
         self.alert = alert
+        self.alerts_loaded: bool = filtered_alerts is not None
+        """Shows a loading state instead of claiming that there are no alerts."""
         self.alert_pages: list[font_helper.Page] | None = None
         self.alert_pages_size: tuple[int, int] | None = None
 
@@ -113,6 +126,15 @@ class AlertEmbed(embeds.Embed):
 
         return changes
 
+    def get_next_progress_update(self, progress: float) -> float | None:
+        if self.alert_pages is None:
+            return None
+
+        next_page_progress: float = (self.page_index + 1) / len(self.alert_pages)
+        if next_page_progress >= 1.0:
+            return None
+        return next_page_progress
+
     def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
         flags.clear_background = False
         if not self._first_frame_rendered:
@@ -136,9 +158,17 @@ class AlertEmbed(embeds.Embed):
         font = alert_font.get_size(round(size[1] / 11))
         page_index_font = page_font.get_size(round(size[1] / 20))
 
+        # Alerts not loaded yet
+        if not self.alerts_loaded:
+            loading_render = font_helper.render_text(font, "Ladataan häiriötiedotteita...", True, (80, 80, 80))
+            loading_x: int = round(size[0] / 2 - loading_render.get_width() / 2)
+            loading_y: int = round(size[1] / 2 - loading_render.get_height() / 2)
+            surf.blit(loading_render, (loading_x, loading_y))
+            return surf
+
         # No alerts
         if self.alert is None:
-            no_alerts_render = font.render("Ei häiriöitä Nyssen toiminnassa.", True, (80, 80, 80))
+            no_alerts_render = font_helper.render_text(font, "Ei häiriöitä Nyssen toiminnassa.", True, (80, 80, 80))
             no_alerts_x: int = round(size[0] / 2 - no_alerts_render.get_width() / 2)
             no_alerts_y: int = round(size[1] / 2 - no_alerts_render.get_height() / 2)
             surf.blit(no_alerts_render, (no_alerts_x, no_alerts_y))
@@ -153,7 +183,7 @@ class AlertEmbed(embeds.Embed):
 
         # Page index
         if page_count > 1:
-            page_index_render = page_index_font.render(f"{self.page_index + 1}/{page_count}", True, colors.Colors.BLACK)
+            page_index_render = font_helper.render_text(page_index_font, f"{self.page_index + 1}/{page_count}", True, colors.Colors.BLACK)
             surf.blit(page_index_render, (size[0] - page_index_render.get_width() - content_spacing, content_spacing))
 
         # Text body
@@ -170,10 +200,10 @@ class AlertEmbed(embeds.Embed):
         return "alerts"
 
     def requested_duration(self) -> float:
-        return -1.0 if not self.display_if_no_alerts and self.alert is None and self._first_alert_loaded else 15.0
+        return -1.0 if not self.display_if_no_alerts and self.alert is None and self._filtered_alerts is not None else 15.0
 
 
-def _alert_meets_filter_requirements(alert: digitransit.routing.Alert, include_global: bool, include_local: bool) -> bool:
+def _alert_meets_filter_requirements(alert: digitransit.routing.Alert, include_global: bool, include_local: bool, rendered_stop_gtfsId: str) -> bool:
     def alert_is_global(alert: digitransit.routing.Alert) -> bool:
         return alert.route is None and alert.stop is None
 
@@ -186,8 +216,6 @@ def _alert_meets_filter_requirements(alert: digitransit.routing.Alert, include_g
         if alert_is_global(alert): # Global alert handling is handled earlier. If it is global, it must be valid.
             return True # Alert is global, True is returned
 
-        rendered_stop_gtfsId = render_info.get_stop_gtfsId()
-
         # Alert is local
         if alert.stop is not None and alert.stop.gtfsId != rendered_stop_gtfsId: # Return false if the alert has defined a stop that is not the same as the displayed stop
             return False # Alert is local and it does not apply to the displayed stop, False is returned
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from datetime import date, datetime, time, timedelta, tzinfo
 from types import EllipsisType
 from typing import Final, NamedTuple
@@ -8,7 +9,7 @@ import pygame
 from nalpy import math
 
 import embeds
-from core import colors, electricity, elements, font_helper, logging, datetime_utils
+from core import colors, electricity, elements, font_helper, logging, datetime_utils, embed_worker
 
 
 class _ElectricityScale(NamedTuple):
@@ -62,6 +63,14 @@ class ElectricityPricesEmbed(embeds.Embed):
 
         self.render_future_prices: bool = False
 
+        self._chart: pygame.Surface | None = None
+        self._chart_key: tuple | None = None
+        """Size, shown day and chart time of `_chart`. The chart is rendered in the embed worker."""
+        self._pending_chart_key: tuple | None = None
+        """Key of the chart that is being rendered in the embed worker."""
+        self._pending_chart_lock: threading.Lock = threading.Lock()
+        """The chart is polled on the render thread, but `on_disable` is called from the embed cycle thread."""
+
     def _set_today_prices(self, _: date, prices: tuple[electricity.ElectricityPrice | None, ...]):
         self.today_prices = prices
 
@@ -95,23 +104,61 @@ class ElectricityPricesEmbed(embeds.Embed):
     def on_disable(self):
         self.render_future_prices = False
 
+        with self._pending_chart_lock:
+            if self._pending_chart_key is not None:
+                embed_worker.discard(self._pending_chart_key)
+                self._pending_chart_key = None
+
     def update(self, context: embeds.EmbedContext) -> bool | EllipsisType:
         if self.next_day_prices is not None and context.progress > 0.5 and not self.render_future_prices:
             self.render_future_prices = True
-            return True
 
-        return context.first_frame
-
-    def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
-        flags.clear_background = False # No need to clear background because surface is solid
+        return self._poll_chart()
 
+    def _poll_chart(self) -> bool:
+        """Render the chart for the shown prices in the embed worker. Returns `True` when a new chart is available."""
         are_future_prices: bool = self.render_future_prices
         prices: tuple[electricity.ElectricityPrice | None, ...] | None = self.today_prices if not are_future_prices else self.next_day_prices
-
         if prices is None:
-            logging.debug("Electricity price data is not loaded yet! Cancelling electricity price embed rendering...", stack_info=False)
+            return False
+
+        size: tuple[int, int] = elements.position_params.embed_rect.size
+        # The chart shows the time with minute precision. Future prices do not show the time at all.
+        chart_time: datetime = self._enable_time.replace(second=0, microsecond=0)
+        key: tuple = (size, self.today_prices_date if not are_future_prices else self.next_day_prices_date, are_future_prices, chart_time if not are_future_prices else None)
+        if key == self._chart_key:
+            return False
+
+        job_key: tuple = ("electricity_prices", *key)
+        with self._pending_chart_lock:
+            if self._pending_chart_key is not None and self._pending_chart_key != job_key:
+                embed_worker.discard(self._pending_chart_key) # Superseded, for example by switching to future prices
+
+            chart: pygame.Surface | None = embed_worker.poll(job_key, render_chart_in_worker, size, prices, are_future_prices, chart_time)
+            if chart is embed_worker.PENDING:
+                self._pending_chart_key = job_key
+                return False
+            self._pending_chart_key = None
+
+        self._chart = chart
+        self._chart_key = key
+        return True
+
+    def get_next_progress_update(self, progress: float) -> float | None:
+        if self.next_day_prices is None or self.render_future_prices or progress > 0.5:
             return None
+        return 0.5
 
+    def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
+        flags.clear_background = False # No need to clear background because surface is solid
+
+        if self._chart is None or self._chart.get_size() != size:
+            logging.debug("Electricity price chart is not rendered yet! Showing the previous frame...", stack_info=False)
+            return None
+
+        return self._chart
+
+    def render_chart(self, size: tuple[int, int], prices: tuple[electricity.ElectricityPrice | None, ...], are_future_prices: bool) -> pygame.Surface:
         max_price: electricity.ElectricityPrice = get_max_price(prices)
         render_scale: _ElectricityScale = self.smallest_render_scale(max_price.price)
 
@@ -140,7 +187,7 @@ class ElectricityPricesEmbed(embeds.Embed):
         scale_iter_count: int = scales_count + 1
 
         font_size: int = round(size[1] / 30)
-        scale_prices: list[pygame.Surface] = [electricity_scales_font.get_size(font_size).render(str(i * value_per_scale), True, SCALES_COLOR_DARK) for i in range(scale_iter_count)]
+        scale_prices: list[pygame.Surface] = [font_helper.render_text(electricity_scales_font.get_size(font_size), str(i * value_per_scale), True, SCALES_COLOR_DARK) for i in range(scale_iter_count)]
         scales_data_width: int = max(scale_prices, key=lambda s: s.get_width()).get_width()
         scales_data_width += SCALES_DATA_MARGIN
 
@@ -202,7 +249,7 @@ class ElectricityPricesEmbed(embeds.Embed):
                     time_line_x -= 1
 
                 pygame.draw.line(surf, TIME_LINE_COLOUR, (time_line_x, 0), (time_line_x, bar_size[1]), width=TIME_LINE_WIDTH)
-                now_text: pygame.Surface = electricity_scales_font.get_size(font_size).render(enable_time.strftime("%H:%M"), True, (0, 0, 0))
+                now_text: pygame.Surface = font_helper.render_text(electricity_scales_font.get_size(font_size), enable_time.strftime("%H:%M"), True, (0, 0, 0))
                 surf.blit(now_text, (time_line_x + 2 * TIME_LINE_WIDTH, 0))
             else: # Data not in the current hour
                 bar_sat: float = BAR_PAST_SAT if price.date == enable_date and price.hour < enable_hour else BAR_DEFAULT_SAT # Past or future saturation to be used
@@ -228,7 +275,7 @@ class ElectricityPricesEmbed(embeds.Embed):
         price_rnd_top: int = approx_center_y - round(price_rnd.get_height() / 2)
         surf.blit(price_rnd, (price_rnd_left, price_rnd_top))
 
-        label_rnd = electricity_scales_font.get_size(label_height).render(label, True, (0, 0, 0))
+        label_rnd = font_helper.render_text(electricity_scales_font.get_size(label_height), label, True, (0, 0, 0))
         label_rnd_left: int = round(math.lerp(rect.left, price_rnd_left, 0.5) - label_rnd.get_width() / 2)
         label_rnd_top: int = approx_center_y - round(label_rnd.get_height() / 2)
         surf.blit(label_rnd, (label_rnd_left, label_rnd_top))
@@ -348,8 +395,14 @@ class ElectricityPricesEmbed(embeds.Embed):
     def requested_duration(self) -> float:
         return 15.0
 
+def render_chart_in_worker(size: tuple[int, int], prices: tuple[electricity.ElectricityPrice | None, ...], are_future_prices: bool, enable_time: datetime) -> pygame.Surface:
+    """Run in the embed worker process."""
+    embed = ElectricityPricesEmbed()
+    embed._enable_time = enable_time
+    return embed.render_chart(size, prices, are_future_prices)
+
 def data_price_with_color(ref_height: int, line_height: int, price: float) -> pygame.Surface:
-    text: pygame.Surface = electricity_scales_bold_font.get_size(ref_height).render(f"{price:.2f} snt/kWh", True, (0, 0, 0))
+    text: pygame.Surface = font_helper.render_text(electricity_scales_bold_font.get_size(ref_height), f"{price:.2f} snt/kWh", True, (0, 0, 0))
     height: int = text.get_height()
 
     line_thickness: int = round(line_height * 0.2)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 import datetime
-import threading
+from concurrent.futures import Future
 from types import EllipsisType
 from typing import NamedTuple, Sequence
 
@@ -12,7 +12,7 @@ import pyproj
 import nysse.styles
 import nysse.vehicle_monitoring
 
-from core import debug, elements, render_info, logging, config, font_helper, colors
+from core import debug, elements, logging, config, font_helper, colors, fetch_loop, textures, embed_worker
 from nalpy import math
 import digitransit.routing
 
@@ -40,36 +40,38 @@ class LineEmbed(embeds.Embed):
             assert isinstance(self.display_vehicles, bool), "First argument must be an integer 0 or 1 defining if vehicles should be displayed on the line!"
 
         self.vehicle_positions: tuple[nysse.vehicle_monitoring.MonitoredVehicleJourney, ...] | None = None
-        self.vehicle_request_thread: threading.Thread | None = None
+        self.vehicle_request: Future[tuple[nysse.vehicle_monitoring.MonitoredVehicleJourney, ...]] | None = None
 
         self.vehicles_rendered: bool = True # Flag is set False after first position fetch
 
-    def _get_positions(self, route_shortname: str):
-        client_id: str | None = config.current.nysse_api_client_id
-        client_secret: str | None = config.current.nysse_api_client_secret
+    def _get_positions(self, route_shortname: str) -> tuple[nysse.vehicle_monitoring.MonitoredVehicleJourney, ...]:
+        client_id: str | None = self.board.config.nysse_api_client_id
+        client_secret: str | None = self.board.config.nysse_api_client_secret
         if client_id is None or client_secret is None:
             raise ValueError("Nysse API client ID and client secret must be defined for vehicle positions in line embed.")
 
-        self.vehicle_positions = nysse.vehicle_monitoring.get_monitored_vehicle_journeys(client_id, client_secret, route_shortname)
+        return nysse.vehicle_monitoring.get_monitored_vehicle_journeys(client_id, client_secret, route_shortname)
+
+    def _set_positions(self, positions: tuple[nysse.vehicle_monitoring.MonitoredVehicleJourney, ...]) -> None:
+        self.vehicle_positions = positions
         self.vehicles_rendered = False
 
     def on_enable(self):
-        assert render_info.stopinfo.stoptimes is not None
-        self.trip = render_info.stopinfo.stoptimes[0].trip
+        stopinfo: digitransit.routing.Stop = self.board.stopinfo
+        assert stopinfo.stoptimes is not None
+        self.trip = stopinfo.stoptimes[0].trip
         assert self.trip is not None
 
         route_shortname: str | None = self.trip.route.shortName
         assert route_shortname is not None
 
-        if self.vehicle_request_thread is not None and self.vehicle_request_thread.is_alive():
-            logging.warning("Vehicle request thread still active. Waiting for thread to finish...")
-            self.vehicle_request_thread.join()
-
         # self.vehicle_positions = None
         # We want to preserve the last positions because the request is so much slower on a Raspberry Pi
         if self.display_vehicles:
-            self.vehicle_request_thread = threading.Thread(target=self._get_positions, args=(route_shortname,), name=f"VehicleRequest_{route_shortname}", daemon=False)
-            self.vehicle_request_thread.start()
+            if self.vehicle_request is not None and not self.vehicle_request.done():
+                logging.warning("Vehicle request still active. Skipping new request...")
+            else:
+                self.vehicle_request = fetch_loop.submit(f"VehicleRequest_{route_shortname}", self._get_positions, route_shortname, on_result=self._set_positions)
 
         self.line_rendered: bool = False
 
@@ -83,38 +85,53 @@ class LineEmbed(embeds.Embed):
             last_render_cache_clear = context.update.time
             line_render_cache.clear()
 
-        if not self.line_rendered:
+        if not self.line_rendered and self._poll_line_render():
             self.line_rendered = True
             return True
-        if not self.vehicles_rendered:
+        if not self.vehicles_rendered and self._get_line_render_key() in line_render_cache:
             self.vehicles_rendered = True
             return True
         return False
 
-    def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
-        global last_render_cache_clear, line_render_cache_size, line_render_cache
-
+    def _get_line_render_key(self) -> tuple[str, tuple[int, int]]:
         trip = self.trip
         assert trip is not None
 
-        if line_render_cache_size is None or line_render_cache_size != size:
-            logging.debug("Clearing line render cache... (Size)", stack_info=False)
-            line_render_cache_size = size
-            line_render_cache.clear()
+        # Keyed by size as boards with different sizes share the cache
+        embed_size: tuple[int, int] = elements.position_params.embed_rect.size
+        return (trip.patternCode, embed_size)
 
-        patternCode = trip.patternCode
-        if patternCode not in line_render_cache:
-            rendered: CachedLineRender | None = render_embed_for_pattern(patternCode, size)
-            if rendered is None:
-                logging.error("Map line could not be rendered.")
-                return
-            else:
-                line_render_cache[patternCode] = rendered
-                debug.set_custom_field("line_render_cache_length", "Line Render Cache Length", len(line_render_cache))
+    def _poll_line_render(self) -> bool:
+        """Render the line in the embed worker. Returns `True` once the render is available or has failed."""
+        cache_key: tuple[str, tuple[int, int]] = self._get_line_render_key()
+        if cache_key in line_render_cache:
+            return True
 
-        cached_render: CachedLineRender = line_render_cache[patternCode]
+        board_config: config.Config = self.board.config
+        rendered: CachedLineRender | None = embed_worker.poll(cache_key, render_embed_for_pattern, cache_key[0], cache_key[1], board_config.endpoint, board_config.api_key.value)
+        if rendered is embed_worker.PENDING:
+            return False
 
+        if rendered is None:
+            logging.error("Map line could not be rendered.")
+        else:
+            line_render_cache[cache_key] = rendered
+            debug.set_custom_field("line_render_cache_length", "Line Render Cache Length", len(line_render_cache))
+        return True
+
+    def render(self, size: tuple[int, int], flags: elements.RenderFlags) -> pygame.Surface | None:
         flags.clear_background = False
+
+        trip = self.trip
+        assert trip is not None
+
+        cached_render: CachedLineRender | None = line_render_cache.get((trip.patternCode, size))
+        if cached_render is None:
+            # Keep showing the previous frame while the line is being rendered.
+            # Clear it if the render failed or is no longer in the cache so that the previous embed doesn't stay on screen.
+            flags.clear_background = self.line_rendered
+            return None
+
         surf: pygame.Surface = cached_render.surface.copy()
 
         if self.vehicle_positions is not None:
@@ -130,8 +147,7 @@ class LineEmbed(embeds.Embed):
         return 15.0
 
 last_render_cache_clear: datetime.datetime | None = None
-line_render_cache_size: tuple[int, int] | None = None
-line_render_cache: dict[str, CachedLineRender] = {}
+line_render_cache: dict[tuple[str, tuple[int, int]], CachedLineRender] = {}
 
 class _RemappedPoints(NamedTuple):
     points: list[math.Vector2]
@@ -325,13 +341,12 @@ def _renderData(pattern: digitransit.routing.Pattern, height: int, padding: int)
 
     if pattern.route.mode is None:
         return None
-    pictogram = nysse.styles.load_pictogram_by_mode(pattern.route.mode, True)
+    pictogram = nysse.styles.load_pictogram_by_mode(pattern.route.mode, True, (pictogram_size, pictogram_size))
     if pictogram is None:
         return None
-    pictogram = pygame.transform.smoothscale(pictogram, (pictogram_size, pictogram_size)).convert_alpha()
 
-    data_number: pygame.Surface = sized_font_bold.render(f"{pattern.route.shortName} ", True, colors.Colors.WHITE)
-    data: pygame.Surface = sized_font.render(pattern.route.longName, True, colors.Colors.WHITE)
+    data_number: pygame.Surface = font_helper.render_text(sized_font_bold, f"{pattern.route.shortName} ", True, colors.Colors.WHITE)
+    data: pygame.Surface = font_helper.render_text(sized_font, pattern.route.longName, True, colors.Colors.WHITE)
 
     centery = height / 2
     pictogram_rect: pygame.Rect = pygame.Rect(padding, round(centery - pictogram.get_height() / 2), *pictogram.get_size())
@@ -348,8 +363,9 @@ def _renderData(pattern: digitransit.routing.Pattern, height: int, padding: int)
 
     return surf
 
-def render_embed_for_pattern(patternCode: str, size: tuple[int, int]) -> CachedLineRender | None:
-    pattern: digitransit.routing.Pattern | None = _get_pattern(patternCode)
+def render_embed_for_pattern(patternCode: str, size: tuple[int, int], endpoint: str, api_key: str) -> CachedLineRender | None:
+    """Run in the embed worker process. Nothing can be read from the render thread's modules like `config`."""
+    pattern: digitransit.routing.Pattern | None = _get_pattern(endpoint, api_key, patternCode)
     if pattern is None:
         return None
 
@@ -367,20 +383,18 @@ def render_embed_for_pattern(patternCode: str, size: tuple[int, int]) -> CachedL
 
     return line
 
-def _get_pattern(patternCode: str) -> digitransit.routing.Pattern | None:
+def _get_pattern(endpoint: str, api_key: str, patternCode: str) -> digitransit.routing.Pattern | None:
     pattern: digitransit.routing.Pattern | None = None
     try:
-        pattern = digitransit.routing.get_pattern(config.current.endpoint, config.current.api_key.value, patternCode)
+        pattern = digitransit.routing.get_pattern(endpoint, api_key, patternCode)
     except Exception as e:
         logging.dump_exception(e, note="lineEmbed")
 
     return pattern
 
-vehicle_base: pygame.Surface | None = None
+VEHICLE_TEXTURE_PATH: str = "resources/textures/elements/line_map/vehicle.png"
 def _draw_vehicle(surface: pygame.Surface, center: math.Vector2, bearing: float, line_thickness: int) -> None:
-    global vehicle_base
-    if vehicle_base is None:
-        vehicle_base = pygame.image.load("resources/textures/elements/line_map/vehicle.png").convert_alpha()
+    vehicle_base: pygame.Surface = textures.load(VEHICLE_TEXTURE_PATH)
 
     target_size: int = 6 * line_thickness
     scale_factor: float = target_size / vehicle_base.get_height()
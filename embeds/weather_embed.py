@@ -3,7 +3,7 @@ from types import EllipsisType
 
 import embeds
 from nalpy import math
-from core import elements, weather_handler, colors, font_helper, logging, datetime_utils
+from core import elements, weather_handler, colors, font_helper, logging, datetime_utils, textures
 import pygame
 import time
 from typing import Iterable, NamedTuple, Sequence
@@ -134,11 +134,11 @@ class WeatherEmbed(embeds.Embed):
         symbol = weather_handler.get_weather_symbol(weather.symbol_id)
         symbol_width: int = symbol.get_width()
         symbol_size_multiplier = (surface_size[0] / symbol_width)
-        symbol = pygame.transform.smoothscale(symbol, (round(symbol_width * symbol_size_multiplier), round(symbol.get_height() * symbol_size_multiplier)))
+        symbol = textures.get_scaled(weather_handler.get_weather_symbol_path(weather.symbol_id), (round(symbol_width * symbol_size_multiplier), round(symbol.get_height() * symbol_size_multiplier)))
         surface.blit(symbol, (round((surface.get_width() / 2) - (symbol.get_width() / 2)), 0))
 
-        time = font.render((weather.time_local).strftime("%H:%M"), True, colors.Colors.BLACK)
-        temperature = font.render(f"{math.round_away_from_zero(weather.temperature)}°C", True, colors.Colors.BLACK)
+        time = font_helper.render_text(font, (weather.time_local).strftime("%H:%M"), True, colors.Colors.BLACK)
+        temperature = font_helper.render_text(font, f"{math.round_away_from_zero(weather.temperature)}°C", True, colors.Colors.BLACK)
         top = symbol.get_height()
         temperature_y = surface_size[1] - temperature.get_height()
         centerx = surface_size[0] / 2
@@ -166,11 +166,11 @@ class WeatherEmbed(embeds.Embed):
         symbol = weather_handler.get_weather_symbol(weather.symbol_id)
         symbol_width: int = symbol.get_width()
         symbol_size_multiplier = (surface_size[0] / symbol_width)
-        symbol = pygame.transform.smoothscale(symbol, (round(symbol_width * symbol_size_multiplier), round(symbol.get_height() * symbol_size_multiplier)))
+        symbol = textures.get_scaled(weather_handler.get_weather_symbol_path(weather.symbol_id), (round(symbol_width * symbol_size_multiplier), round(symbol.get_height() * symbol_size_multiplier)))
         surface.blit(symbol, (round((surface.get_width() / 2) - (symbol.get_width() / 2)), 0))
 
-        time = font.render((weather.time_local).strftime("%H:%M"), True, colors.Colors.BLACK)
-        temperature = font.render(f"{math.round_away_from_zero(weather.temperature)}°C", True, colors.Colors.BLACK)
+        time = font_helper.render_text(font, (weather.time_local).strftime("%H:%M"), True, colors.Colors.BLACK)
+        temperature = font_helper.render_text(font, f"{math.round_away_from_zero(weather.temperature)}°C", True, colors.Colors.BLACK)
         y = round(surface_size[1] - 1.5 * max(time.get_height(), temperature.get_height()))
 
         surface.blit(time, (0, y))
@@ -1,20 +1,26 @@
 import datetime
 import os
+import sys
 import threading
+from concurrent.futures import Future
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
 import pygame
 
-from core import logging, config, render_info, debug, thread_exception_handler, renderer, elements, threadex
+from core import logging, config, render_info, debug, thread_exception_handler, renderer, elements, frame_sink, frame_scheduler, textures, boards, embed_worker, http_client, fetch_loop
 
 def main():
     init()
 
     running: bool = True
     while running:
-        context: elements.UpdateContext = elements.UpdateContext(datetime.datetime.now(), render_info.stopinfo)
+        events: list[pygame.event.Event] = frame_scheduler.wait(get_next_deadline(datetime.datetime.now()), config.current.max_idle_time)
+
+        fetch_loop.process_results()
+
+        boards.get_boards()[0].activate() # Events are handled by the window board
 
         #region Event handling
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYUP:
@@ -42,15 +48,36 @@ def main():
                         debug.rect_enabled = True
                         renderer.reset_debug_colors()
                         renderer.force_rerender(size=renderer.get_size())
+                elif event.key == pygame.K_F8:
+                    if debug.enabled:
+                        debug.element_timings.export()
+                        textures.export()
+                elif event.key == pygame.K_F9:
+                    if not debug.blit_batching_enabled:
+                        debug.blit_batching_enabled = True
+                    elif debug.enabled:
+                        debug.blit_batching_enabled = False
             elif event.type == pygame.WINDOWSIZECHANGED:
                 renderer.force_rerender(size=(event.x, event.y))
         #endregion
 
-        renderer.update(context)
-        renderer.render(context.time, config.current.framerate)
+        for board in boards.get_boards():
+            board.activate()
+            context: elements.UpdateContext = elements.UpdateContext(datetime.datetime.now(), render_info.active.stopinfo)
+            renderer.update(context)
+            renderer.render(context.time, config.current.framerate)
 
     quit()
 
+def get_next_deadline(now: datetime.datetime) -> datetime.datetime | None:
+    deadline: datetime.datetime | None = None
+    for board in boards.get_boards():
+        board.activate()
+        board_deadline: datetime.datetime | None = renderer.get_next_deadline(now)
+        if board_deadline is not None and (deadline is None or board_deadline < deadline):
+            deadline = board_deadline
+    return deadline
+
 def initialize_renderers():
     renderer.add_renderer(elements.HeaderIconsRenderer())
     renderer.add_renderer(elements.HeaderNysseRenderer())
@@ -62,57 +89,95 @@ def initialize_renderers():
 
     renderer.add_renderer(elements.DebugRenderer())
 
+    previous_row: tuple[elements.StoptimeShortnameRenderer, elements.StoptimeHeadsignRenderer, elements.StoptimeTimeRenderer] | None = None
     for i in range(config.current.departure_count):
         shortname = elements.StoptimeShortnameRenderer(i)
         time = elements.StoptimeTimeRenderer(i)
         headsign = elements.StoptimeHeadsignRenderer(i, shortname, time)
 
+        if previous_row is not None:
+            previous_row[0].next_row = shortname
+            previous_row[1].next_row = headsign
+            previous_row[2].next_row = time
+        previous_row = (shortname, headsign, time)
+
         renderer.add_renderer(shortname)
         renderer.add_renderer(headsign)
         renderer.add_renderer(time)
 
+def _writes_frames_into_stdout(base_config: config.Config) -> bool:
+    if frame_sink.writes_into_stdout(base_config.frame_output_format, base_config.frame_output_path):
+        return True
+    return any(frame_sink.writes_into_stdout(overrides.get("frame_output_format", base_config.frame_output_format), overrides.get("frame_output_path", base_config.frame_output_path)) for overrides in base_config.boards)
+
 def init():
     #region Initialization
-    logging.init()
+    # Config is loaded before logging as console output must not be mixed with raw frames written into stdout
+    config.init()
+    logging.init(sys.stderr if _writes_frames_into_stdout(config.current) else None)
 
     threading.excepthook = thread_exception_handler.thread_excepthook
 
-    logging.debug("Loading config...", stack_info=False)
-    config.init()
+    boards.init()
 
     logging.debug("Starting timers...", stack_info=False)
+    fetch_loop.init()
     start_timers()
 
-    logging.debug("Initializing renderers...", stack_info=False)
-    initialize_renderers()
-
-    logging.debug("Creating window...", stack_info=False)
+    headless: bool = config.current.headless or boards.is_multi_board()
+    if headless:
+        logging.debug("Creating offscreen surface...", stack_info=False)
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    else:
+        logging.debug("Creating window...", stack_info=False)
     pygame.init()
     renderer_flags: int = pygame.RESIZABLE
     if config.current.fullscreen:
         renderer_flags |= pygame.FULLSCREEN
-    renderer.init(config.current.window_size, renderer_flags)
 
-    pygame.mouse.set_visible(not config.current.hide_mouse)
-    logging.info(f"Mouse visibility: {pygame.mouse.get_visible()}", stack_info=False)
+    logging.debug("Initializing renderers...", stack_info=False)
+    for board in boards.get_boards():
+        board.activate()
+        initialize_renderers()
+
+        sink: frame_sink.FrameSink | None = None
+        if config.current.frame_output_format is not None:
+            sink = frame_sink.create_frame_sink(config.current.frame_output_format, config.current.frame_output_path)
+        renderer.init(config.current.window_size, renderer_flags, offscreen=headless, sink=sink)
+
+    if not headless:
+        pygame.mouse.set_visible(not config.current.hide_mouse)
+        logging.info(f"Mouse visibility: {pygame.mouse.get_visible()}", stack_info=False)
 
     logging.info("Initialization Finished!", stack_info=False)
     #endregion
 
-timers: list[threadex.RepeatingTimer] = []
+timers: list[Future] = []
 def start_timers():
-    stopinfo = threadex.RepeatingTimer("StopInfoTimer", config.current.poll_rate, render_info.update_stopinfo)
-    timers.append(stopinfo)
-    stopinfo.start_synchronous()
+    boards.update_stopinfos() # Stop info is required before the first frame
+
+    for poll_rate, poll_group in boards.get_poll_groups().items():
+        stopinfo = fetch_loop.submit_repeating(f"StopInfoFetch_{poll_rate}", poll_rate, boards.fetch_stopinfos, poll_group, on_result=boards.set_stopinfos, initial_delay=poll_rate)
+        timers.append(stopinfo)
 
-    render_info.start_embed_cycling()
+    for board in boards.get_boards():
+        board.activate()
+        render_info.start_embed_cycling()
 
 def quit():
     for t in timers:
         t.cancel()
 
-    render_info.stop_embed_cycling()
+    for board in boards.get_boards():
+        board.activate()
+        render_info.stop_embed_cycling()
+        renderer.quit()
+
+    fetch_loop.quit()
+    embed_worker.quit()
+    http_client.close()
 
+    boards.quit()
     config.quit()
 
 if __name__ == "__main__":
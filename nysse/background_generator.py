@@ -1,9 +1,74 @@
+import os
+from collections import OrderedDict
 from core.colors import NysseColors
+from core import config, logging
+import numpy
 import pygame
 import pygame.gfxdraw
 from nalpy import math
 
-def generate_background(px_size: tuple[int, int]) -> pygame.Surface:
+CACHE_DIRECTORY: str = "./cache/backgrounds"
+_CACHE_VERSION: int = 1
+"""Increment whenever the generated image changes so that old cache files are not used."""
+
+disk_cache_enabled: bool = True
+"""Load and save backgrounds in `CACHE_DIRECTORY`. Disabled by the benchmark so that its results do not depend on earlier runs."""
+
+_MAX_MEMORY_CACHE_SIZE: int = 4
+_memory_cache: OrderedDict[tuple[int, int], pygame.Surface] = OrderedDict()
+"""Backgrounds generated during this run keyed by size. Shared by all boards with the same size. LRU bounded to `_MAX_MEMORY_CACHE_SIZE` sizes as resizing the window goes through many transient sizes."""
+
+def _get_cache_path(px_size: tuple[int, int]) -> str:
+    palette: str = "-".join(f"{r:02x}{g:02x}{b:02x}" for r, g, b in (NysseColors.KESKISININEN, NysseColors.TUMMANSININEN))
+    return os.path.join(CACHE_DIRECTORY, f"{px_size[0]}x{px_size[1]}_{palette}_v{_CACHE_VERSION}.png")
+
+def _load_cached(path: str, px_size: tuple[int, int]) -> pygame.Surface | None:
+    if not os.path.isfile(path):
+        return None
+
+    try:
+        surf: pygame.Surface = pygame.image.load(path)
+    except pygame.error as e:
+        logging.warning(f"Could not load cached background: {e}", stack_info=False)
+        return None
+
+    if surf.get_size() != px_size:
+        return None
+    return surf.convert() # Loaded images keep the file format, convert so that blits onto the display are not converted every frame
+
+def _save_cached(path: str, surf: pygame.Surface) -> None:
+    temp_path: str = path.removesuffix(".png") + ".tmp.png" # pygame picks the image format from the extension
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pygame.image.save(surf, temp_path)
+        os.replace(temp_path, path) # Never leave a partially written image behind
+    except (OSError, pygame.error) as e:
+        logging.warning(f"Could not cache background: {e}", stack_info=False)
+
+def _add_to_memory_cache(px_size: tuple[int, int], surf: pygame.Surface) -> None:
+    _memory_cache[px_size] = surf
+    _memory_cache.move_to_end(px_size)
+    if len(_memory_cache) > _MAX_MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+def generate_background(px_size: tuple[int, int], use_cache: bool = True) -> pygame.Surface:
+    """
+    Generate the background or load it from the disk cache if it has been generated with the same size and colors before.
+    Only backgrounds of the configured `window_size` are saved to the disk cache.
+
+    The returned surface is shared when `use_cache` is True. Copy it before drawing onto it.
+    """
+    px_size = (px_size[0], px_size[1])
+    cache_path: str = _get_cache_path(px_size)
+    use_disk_cache: bool = use_cache and disk_cache_enabled
+    if use_cache:
+        cached: pygame.Surface | None = _memory_cache.get(px_size)
+        if cached is None and use_disk_cache:
+            cached = _load_cached(cache_path, px_size)
+        if cached is not None:
+            _add_to_memory_cache(px_size, cached)
+            return cached
+
     surf = pygame.Surface(px_size)
     surf.fill(NysseColors.KESKISININEN)
 
@@ -14,49 +79,43 @@ def generate_background(px_size: tuple[int, int]) -> pygame.Surface:
     sine_freq: float = 19.6452 / sine_rect.width
     sine_amp = 0.0155 * sine_rect.height
 
-    points: list[tuple[float, float]] = []
-    for iter_x in range(0, round(sine_length * 1.1), 1): # Added some extra x points to fix sine not being long enough
-        p = _generate_sine(iter_x, sine_freq, sine_amp)
-        points.append(p)
+    xs, ys = _generate_sine(numpy.arange(0, round(sine_length * 1.1), dtype=numpy.float64), sine_freq, sine_amp) # Added some extra x points to fix sine not being long enough
 
     # Transform points
-    for i in range(len(points)):
-        x, y = points[i]
+    xs -= (sine_length - sine_rect.width) / 2
+    ys += sine_rect.height / 2
 
-        x -= (sine_length - sine_rect.width) / 2
-        y += sine_rect.height / 2
+    xs, ys = _rotate_points((sine_rect.centerx, sine_rect.centery), xs, ys, math.radians(-45.0))
 
-        x, y = _rotate_point((sine_rect.centerx, sine_rect.centery), (x, y), math.radians(-45.0))
-
-        points[i] = (x, y)
-
-
-    points.insert(0, (0, 0))
-    points.append((0, 0))
+    points: list[tuple[float, float]] = [(0, 0), *zip(xs.tolist(), ys.tolist()), (0, 0)]
 
     pygame.gfxdraw.filled_polygon(surf, points, NysseColors.TUMMANSININEN)
 
+    if use_cache:
+        if use_disk_cache and px_size == tuple(config.current.window_size): # Other sizes are usually transient, i.e. while resizing the window
+            _save_cached(cache_path, surf)
+        _add_to_memory_cache(px_size, surf)
+
     return surf
 
 
-def _generate_sine(x: float, wave_frequency: float, wave_amplitude: float) -> tuple[float, float]:
-    y = wave_amplitude * -math.cos(wave_frequency * x)
-    return (x, y)
+def _generate_sine(xs: numpy.ndarray, wave_frequency: float, wave_amplitude: float) -> tuple[numpy.ndarray, numpy.ndarray]:
+    ys = wave_amplitude * -numpy.cos(wave_frequency * xs)
+    return (xs, ys)
 
-def _rotate_point(origin: tuple[float, float], point: tuple[float, float], angle: float) -> tuple[float, float]:
+def _rotate_points(origin: tuple[float, float], xs: numpy.ndarray, ys: numpy.ndarray, angle: float) -> tuple[numpy.ndarray, numpy.ndarray]:
     """
-    Rotate a point counterclockwise by a given angle around a given origin.
+    Rotate points counterclockwise by a given angle around a given origin.
 
     The angle should be given in radians.
     """
     ox, oy = origin
-    px, py = point
 
     angleSin = math.sin(angle)
     angleCos = math.cos(angle)
 
-    x_diff = px - ox
-    y_diff = py - oy
+    x_diff = xs - ox
+    y_diff = ys - oy
 
     qx = ox + angleCos * x_diff - angleSin * y_diff
     qy = oy + angleSin * x_diff + angleCos * y_diff
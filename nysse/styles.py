@@ -1,7 +1,7 @@
 from digitransit.enums import Mode
+from core import textures
 import pygame
 import pygame.surface
-import pygame.image
 
 _pictogram_lookup: dict[Mode, str] = {
     Mode.BUS: "bussi.png",
@@ -9,7 +9,8 @@ _pictogram_lookup: dict[Mode, str] = {
     Mode.RAIL: "juna.png",
     Mode.TRAM: "ratikka.png"
 }
-def load_pictogram_by_mode(mode: Mode, border: bool = False) -> pygame.Surface | None:
+def load_pictogram_by_mode(mode: Mode, border: bool = False, size: tuple[int, int] | None = None) -> pygame.Surface | None:
+    """Returned surface is shared. Copy it before drawing onto it."""
     if mode not in _pictogram_lookup:
         return None
 
@@ -17,8 +18,9 @@ def load_pictogram_by_mode(mode: Mode, border: bool = False) -> pygame.Surface |
     border_path_segment: str = "border" if border else "borderless"
     path = f"resources/textures/pictograms/{border_path_segment}/{path}"
 
-    surf = pygame.image.load(path).convert_alpha()
-    return surf
+    if size is not None:
+        return textures.get_scaled(path, size)
+    return textures.load(path)
 
 _color_lookup: dict[Mode, tuple[int, int, int]] = {
     Mode.BUS: (28, 87, 207),
@@ -2,7 +2,7 @@ from typing import Callable, NamedTuple, Self, TypeVar
 from xml.etree import ElementTree
 import base64
 
-import requests
+from core import http_client
 
 _T = TypeVar("_T")
 
@@ -128,7 +128,7 @@ def _make_request(client_id: str, client_secret: str, query_xml: str, constructo
         "Authorization": _get_auth(client_id, client_secret)
     }
 
-    response = requests.post(_ENDPOINT, query_xml, headers=headers)
+    response = http_client.post(_ENDPOINT, query_xml, headers=headers)
     if not response.ok:
         raise RuntimeError(f"Invalid response! Response below:\n{response.content.decode('utf-8')}")
 